@@ -0,0 +1,4 @@
+from skillpath.asgi import create_asgi_app
+
+# Async serving mode: uvicorn asgi:app
+app = create_asgi_app()
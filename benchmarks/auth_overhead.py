@@ -0,0 +1,73 @@
+"""Per-request cost of admin authorization: cached principal vs a users query per request.
+
+    python benchmarks/auth_overhead.py --requests 2000 [--database-url postgresql://...]
+
+Runs the same admin endpoint (/admin/db_routing, which does no queries of its
+own) with the cached principal and with admin_required reading the user row on
+every request, as it did before the session store. Reports the SQL statements
+per request and the latency percentiles. On SQLite the saved query is cheap, so
+point --database-url at a networked Postgres to see the real difference.
+"""
+import argparse
+import time
+
+from sqlalchemy import event
+
+from common import make_app, summarize
+
+def uncached_principal(user_id):
+    """The previous behaviour: read the user on every admin request"""
+    from skillpath.extensions import db
+    from skillpath.models import User
+    user = db.session.get(User, user_id)
+    if not user:
+        return None
+    return {'id': user.id, 'username': user.username, 'is_admin': bool(user.is_admin)}
+
+def run(app, requests):
+    from skillpath.extensions import db
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    client.get('/admin/db_routing')
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    listener = lambda *args: statements.append(1)
+    event.listen(engine, 'before_cursor_execute', listener)
+    latencies = []
+    try:
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = client.get('/admin/db_routing')
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.status_code
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+    return len(statements) / requests, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--database-url')
+    parser.add_argument('--session-store', default='filesystem', choices=['filesystem', 'sqlite', 'memory'])
+    args = parser.parse_args()
+
+    settings = {'SESSION_STORE': args.session_store}
+    if args.database_url:
+        settings['DATABASE_URL'] = args.database_url
+    app = make_app(**settings)
+
+    from skillpath import auth
+    cached_principal = auth.get_principal
+
+    print(f"{'principal':>10} {'queries/req':>12} {'p50_ms':>8} {'p99_ms':>8} {'max_ms':>8}")
+    for label, lookup in (('uncached', uncached_principal), ('cached', cached_principal)):
+        auth.get_principal = lookup
+        queries, latencies = run(app, args.requests)
+        stats = summarize(latencies)
+        print(f"{label:>10} {queries:>12.2f} {stats['p50_ms']:>8} {stats['p99_ms']:>8} {stats['max_ms']:>8}")
+    auth.get_principal = cached_principal
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Helpers shared by the benchmark scripts: a throwaway app on SQLite, a threaded server and an HTTP client"""
+import os
+import sys
+import logging
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def make_app(**settings):
+    """Create the app on a fresh SQLite database; settings are applied as environment variables"""
+    workdir = tempfile.mkdtemp(prefix='skillpath-bench-')
+    env = {
+        'DATABASE_URL': f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}?timeout=30",
+        'SESSION_DIR': os.path.join(workdir, 'sessions'),
+        'SESSION_SQLITE_PATH': os.path.join(workdir, 'sessions.sqlite3'),
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'PASSWORD_HASH_WORKERS': '0'
+    }
+    env.update({key: str(value) for key, value in settings.items()})
+    os.environ.update(env)
+
+    from skillpath import create_app
+    from skillpath.schema import init_db
+    app = create_app()
+    init_db(app)
+    return app
+
+def create_users(app, count, password='password', prefix='bench'):
+    """Insert users directly and return their usernames"""
+    from skillpath.auth import hash_password
+    from skillpath.extensions import db
+    from skillpath.models import User
+
+    with app.app_context():
+        password_hash = hash_password(password)
+        usernames = [f'{prefix}{i}' for i in range(count)]
+        db.session.execute(User.__table__.insert(), [
+            {'id': f'{prefix}-{i:06d}', 'username': name, 'email': f'{name}@example.com', 'password_hash': password_hash}
+            for i, name in enumerate(usernames)
+        ])
+        db.session.commit()
+    return usernames
+
+def serve(app):
+    """Run the app under Werkzeug's threaded server (one thread per request); returns its base URL"""
+    from werkzeug.serving import ThreadedWSGIServer, make_server
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    # A listen backlog big enough for every benchmark client to connect at once
+    ThreadedWSGIServer.request_queue_size = 1024
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+def serve_asgi(asgi_app):
+    """Run an ASGI app under uvicorn in a background thread; returns its base URL"""
+    import socket
+    import uvicorn
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    server = uvicorn.Server(uvicorn.Config(asgi_app, log_level='error', backlog=1024))
+    threading.Thread(target=server.run, kwargs={'sockets': [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f'http://127.0.0.1:{sock.getsockname()[1]}'
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+class Client:
+    """Cookie-keeping HTTP client that reports status codes instead of following redirects"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(), NoRedirect())
+
+    def request(self, path, form=None, timeout=120):
+        """Return (status, seconds)"""
+        data = urllib.parse.urlencode(form).encode('utf-8') if form is not None else None
+        started = time.perf_counter()
+        try:
+            with self.opener.open(self.base_url + path, data=data, timeout=timeout) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except OSError:
+            status = 0
+        return status, time.perf_counter() - started
+
+    def login(self, username, password='password'):
+        status, _ = self.request('/login', {'username': username, 'password': password})
+        return status == 302
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def summarize(values):
+    """p50/p99/max in milliseconds"""
+    return {
+        'p50_ms': round(percentile(values, 50) * 1000, 1),
+        'p99_ms': round(percentile(values, 99) * 1000, 1),
+        'max_ms': round(max(values, default=0) * 1000, 1)
+    }
@@ -0,0 +1,153 @@
+"""Throughput and peak RSS of the NDJSON path export and import.
+
+    python benchmarks/export_import.py --steps 1000000 [--gzip]
+
+Fills a throwaway SQLite database with --steps path steps (10 per path), each
+with a progress row and --links resource links. It then exports everything to
+a file with iter_export_records/export_ndjson_chunks (as /admin/export and
+export-paths do) and imports that file into a second, empty database with
+import_records. Peak RSS is sampled every 20 ms during each phase. Run it at two
+sizes to see that memory does not grow with the data.
+"""
+import argparse
+import os
+import resource
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from common import create_users, make_app
+
+STEPS_PER_PATH = 10
+
+def current_rss():
+    """Resident set size in bytes (Linux /proc; falls back to the process peak elsewhere)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class PeakRss:
+    """Track the highest RSS seen while the block runs"""
+
+    def __enter__(self):
+        self.start = self.peak = current_rss()
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def sample(self):
+        while not self.stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            time.sleep(0.02)
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.thread.join()
+        self.peak = max(self.peak, current_rss())
+
+def fill(app, steps, links, user_count=1000):
+    from skillpath.extensions import db
+    from skillpath.models import SkillPath, PathStep, Progress, Resource, StepResource
+
+    user_ids = [f'bench-{i:06d}' for i in range(user_count)]
+    create_users(app, user_count)
+    now = datetime.utcnow()
+    with app.app_context():
+        resource_ids = [str(uuid.uuid4()) for _ in range(1000)]
+        db.session.execute(Resource.__table__.insert(), [
+            {'id': rid, 'title': f'Resource {i}', 'url': f'https://example.com/r/{i}', 'type': 'article',
+             'category': 'Data Scientist', 'created_at': now, 'updated_at': now}
+            for i, rid in enumerate(resource_ids)
+        ])
+        for start in range(0, steps // STEPS_PER_PATH, 1000):
+            paths, path_steps, progress, step_links = [], [], [], []
+            for p in range(start, min(start + 1000, steps // STEPS_PER_PATH)):
+                path_id = str(uuid.uuid4())
+                paths.append({'id': path_id, 'user_id': user_ids[p % user_count], 'title': f'Path {p}',
+                              'description': 'A learning path', 'career_goal': 'Data Scientist',
+                              'current_level': 'beginner', 'interests': 'statistics', 'weekly_hours': 10,
+                              'timeline_weeks': 12, 'created_at': now, 'updated_at': now})
+                for n in range(1, STEPS_PER_PATH + 1):
+                    step_id = str(uuid.uuid4())
+                    path_steps.append({'id': step_id, 'skill_path_id': path_id, 'step_number': n,
+                                       'title': f'Step {n}', 'description': 'Learn the next thing',
+                                       'duration_weeks': 1, 'milestone': n % 5 == 0})
+                    progress.append({'id': str(uuid.uuid4()), 'step_id': step_id, 'status': 'todo',
+                                     'updated_at': now})
+                    step_links += [{'id': str(uuid.uuid4()), 'step_id': step_id,
+                                    'resource_id': resource_ids[(p + n + k) % len(resource_ids)]}
+                                   for k in range(links)]
+            db.session.execute(SkillPath.__table__.insert(), paths)
+            db.session.execute(PathStep.__table__.insert(), path_steps)
+            db.session.execute(Progress.__table__.insert(), progress)
+            if step_links:
+                db.session.execute(StepResource.__table__.insert(), step_links)
+            db.session.commit()
+    return user_count
+
+def export(app, path, compress):
+    from skillpath.transfer import iter_export_records, export_ndjson_chunks
+
+    counter = {'records': 0}
+
+    def counted(records):
+        for record in records:
+            counter['records'] += 1
+            yield record
+
+    with app.app_context(), open(path, 'wb') as out:
+        for chunk in export_ndjson_chunks(counted(iter_export_records()), compress):
+            out.write(chunk)
+    return counter['records']
+
+def import_file(app, path):
+    from skillpath.transfer import import_records, open_import_stream
+
+    with app.app_context(), open(path, 'rb') as f:
+        return import_records(open_import_stream(f, path, 'surrogateescape'))
+
+def report(label, records, seconds, size, rss):
+    print(f"{label:>7} {records:>10} {seconds:>8.1f} {records / seconds:>10.0f} {size / seconds / 2 ** 20:>7.1f} "
+          f"{rss.start / 2 ** 20:>9.1f} {rss.peak / 2 ** 20:>9.1f} {(rss.peak - rss.start) / 2 ** 20:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=int, default=1000000)
+    parser.add_argument('--links', type=int, default=1, help='Resource links per step')
+    parser.add_argument('--gzip', action='store_true')
+    args = parser.parse_args()
+
+    source = make_app()
+    started = time.perf_counter()
+    user_count = fill(source, args.steps, args.links)
+    print(f'Filled {args.steps} steps in {time.perf_counter() - started:.1f}s')
+
+    path = os.path.join(tempfile.mkdtemp(prefix='skillpath-export-'), 'paths.ndjson' + ('.gz' if args.gzip else ''))
+    print(f"{'phase':>7} {'records':>10} {'seconds':>8} {'records/s':>10} {'MB/s':>7} "
+          f"{'rss_mb':>9} {'peak_mb':>9} {'growth_mb':>9}")
+
+    with PeakRss() as rss:
+        started = time.perf_counter()
+        records = export(source, path, args.gzip)
+        seconds = time.perf_counter() - started
+    size = os.path.getsize(path)
+    report('export', records, seconds, size, rss)
+
+    target = make_app()
+    create_users(target, user_count)
+    with PeakRss() as rss:
+        started = time.perf_counter()
+        counts = import_file(target, path)
+        seconds = time.perf_counter() - started
+    imported = sum(value for key, value in counts.items() if key not in ('skipped', 'error_count', 'errors'))
+    report('import', imported, seconds, size, rss)
+    print(f'File: {size / 2 ** 20:.1f} MB; import skipped {counts.get("skipped", 0)}, '
+          f'{counts["error_count"]} bad lines')
+
+if __name__ == '__main__':
+    main()
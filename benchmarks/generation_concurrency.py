@@ -0,0 +1,138 @@
+"""Concurrent path generations against a fake LLM: sync worker model vs the async mode.
+
+    python benchmarks/generation_concurrency.py --levels 50 200 500 --llm-seconds 2 --workers 8 512
+
+Each level logs in that many users and has them all submit /generate_path at
+once. The fake LLM sleeps for --llm-seconds and returns a valid path.
+
+- sync: the threaded WSGI server (a thread per request), LLM calls on a pool of
+  GENERATION_WORKERS threads, once per --workers value
+- async: asgi.py under uvicorn, LLM calls awaited on the event loop
+
+Requests that get the AI result are counted separately from those that hit
+GENERATION_DEADLINE_SECONDS and got a locally built path. peak_threads is the
+most threads the server process had running during the level. Servers and
+pools from an earlier mode stay alive, so compare it across separate --modes runs.
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from common import Client, create_users, make_app, serve, serve_asgi, summarize
+
+FORM = {
+    'career_goal': 'Data Scientist',
+    'current_level': 'beginner',
+    'interests': 'statistics and machine learning',
+    'weekly_hours': '10',
+    'timeline_weeks': '12',
+    'skip_similar': '1'
+}
+
+def fake_path():
+    from skillpath.local_generator import generate_local_learning_path
+    return generate_local_learning_path('Data Scientist', 'beginner', 'statistics', 10, 12)
+
+def fake_llm(seconds):
+    def call_openai_api(prompt):
+        time.sleep(seconds)
+        return fake_path()
+    return call_openai_api
+
+def fake_async_llm(seconds):
+    async def acall_openai_api(prompt):
+        await asyncio.sleep(seconds)
+        return fake_path()
+    return acall_openai_api
+
+def run_level(base_url, usernames):
+    clients = [Client(base_url) for _ in usernames]
+    for client, username in zip(clients, usernames):
+        client.login(username)
+
+    barrier = threading.Barrier(len(clients) + 1)
+    results = []
+    lock = threading.Lock()
+
+    def generate(client):
+        barrier.wait()
+        result = client.request('/generate_path', FORM)
+        with lock:
+            results.append(result)
+
+    threads = [threading.Thread(target=generate, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    peak = [0]
+    stop = threading.Event()
+
+    def sample():
+        # Everything but the client threads, this sampler and the main thread belongs to the server
+        excluded = set(threads) | {threading.current_thread(), threading.main_thread()}
+        while not stop.is_set():
+            peak[0] = max(peak[0], sum(1 for t in threading.enumerate() if t not in excluded))
+            time.sleep(0.01)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    stop.set()
+    sampler.join()
+    return results, wall, peak[0]
+
+def run_mode(label, app, base_url, levels):
+    from skillpath.extensions import db
+    from skillpath.models import PathSignature
+
+    for level in levels:
+        usernames = create_users(app, level, prefix=f'{label}c{level}-')
+        with app.app_context():
+            indexed_before = PathSignature.query.count()
+        results, wall, peak_threads = run_level(base_url, usernames)
+        with app.app_context():
+            # Only paths built from an AI result are indexed for reuse
+            ai_served = PathSignature.query.count() - indexed_before
+            db.session.remove()
+
+        ok = [seconds for status, seconds in results if status == 302]
+        stats = summarize(ok)
+        print(f"{label:>10} {level:>10} {wall:>7.1f} {ai_served:>5} {len(ok) - ai_served:>6} "
+              f"{len(results) - len(ok):>6} {peak_threads:>12} {stats['p50_ms']:>9} {stats['p99_ms']:>9} "
+              f"{stats['max_ms']:>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--levels', type=int, nargs='+', default=[50, 200, 500])
+    parser.add_argument('--workers', type=int, nargs='+', default=[8, 512],
+                        help='GENERATION_WORKERS values for the sync mode')
+    parser.add_argument('--modes', nargs='+', default=['sync', 'async'], choices=['sync', 'async'])
+    parser.add_argument('--llm-seconds', type=float, default=2.0)
+    parser.add_argument('--deadline', type=float, default=25.0)
+    args = parser.parse_args()
+
+    settings = {'GENERATION_DEADLINE_SECONDS': args.deadline, 'GENERATION_BACKGROUND_UPGRADE': 0,
+                'OPENAI_RPM': 1000000, 'OPENAI_TPM': 10 ** 10}
+
+    print(f"{'mode':>10} {'concurrent':>10} {'wall_s':>7} {'ai':>5} {'local':>6} {'errors':>6} "
+          f"{'peak_threads':>12} {'p50_ms':>9} {'p99_ms':>9} {'max_ms':>9}")
+    if 'sync' in args.modes:
+        for workers in args.workers:
+            app = make_app(GENERATION_WORKERS=workers, **settings)
+            from skillpath import generation
+            generation.generation_pool = None
+            generation.call_openai_api = fake_llm(args.llm_seconds)
+            run_mode(f'sync-{workers}', app, serve(app), args.levels)
+
+    if 'async' in args.modes:
+        app = make_app(**settings)
+        from skillpath import asgi
+        asgi.acall_openai_api = fake_async_llm(args.llm_seconds)
+        run_mode('async', app, serve_asgi(asgi.create_asgi_app(app)), args.levels)
+
+if __name__ == '__main__':
+    main()
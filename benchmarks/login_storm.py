@@ -0,0 +1,88 @@
+"""Latency of other routes while a cohort logs in at once.
+
+    python benchmarks/login_storm.py --logins 200 --method pbkdf2:sha256:600000 --workers 0 2
+
+For each PASSWORD_HASH_WORKERS value (0 hashes inline on the request threads),
+--logins users log in concurrently. Meanwhile a logged-in probe client polls
+/generate_path/queue, a cheap JSON route. Reports login throughput and the
+probe's p50/p99 latency during the storm, next to a baseline with no storm.
+"""
+import argparse
+import threading
+import time
+
+from common import Client, create_users, make_app, serve, summarize
+
+def probe(client, stop, latencies):
+    while not stop.is_set():
+        status, seconds = client.request('/generate_path/queue')
+        if status == 200:
+            latencies.append(seconds)
+        time.sleep(0.01)
+
+def run_storm(base_url, usernames, probe_client, baseline_seconds):
+    stop = threading.Event()
+    baseline = []
+    thread = threading.Thread(target=probe, args=(probe_client, stop, baseline))
+    thread.start()
+    time.sleep(baseline_seconds)
+    stop.set()
+    thread.join()
+
+    clients = [Client(base_url) for _ in usernames]
+    barrier = threading.Barrier(len(clients) + 1)
+    logins = []
+
+    def login(client, username):
+        barrier.wait()
+        started = time.perf_counter()
+        ok = client.login(username)
+        logins.append((ok, time.perf_counter() - started))
+
+    threads = [threading.Thread(target=login, args=pair) for pair in zip(clients, usernames)]
+    for t in threads:
+        t.start()
+
+    stop = threading.Event()
+    during = []
+    thread = threading.Thread(target=probe, args=(probe_client, stop, during))
+    barrier.wait()
+    started = time.perf_counter()
+    thread.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    stop.set()
+    thread.join()
+    return baseline, during, logins, wall
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--method', default='pbkdf2:sha256:600000', help='PASSWORD_HASH_METHOD')
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2])
+    parser.add_argument('--baseline-seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'logins/s':>9} {'failed':>6} {'login_p99_ms':>12} "
+          f"{'idle_p50_ms':>11} {'idle_p99_ms':>11} {'storm_p50_ms':>12} {'storm_p99_ms':>12}")
+    for workers in args.workers:
+        app = make_app(PASSWORD_HASH_METHOD=args.method, PASSWORD_HASH_WORKERS=workers,
+                       PASSWORD_HASH_MAX_PENDING=max(1, workers * 4))
+        from skillpath import auth
+        auth.password_hash_pool = None
+        usernames = create_users(app, args.logins, prefix=f'storm{workers}-')
+        base_url = serve(app)
+
+        probe_client = Client(base_url)
+        probe_client.login('admin', 'admin123')
+        baseline, during, logins, wall = run_storm(base_url, usernames, probe_client, args.baseline_seconds)
+
+        idle, storm = summarize(baseline), summarize(during)
+        login_stats = summarize([seconds for _, seconds in logins])
+        failed = sum(1 for ok, _ in logins if not ok)
+        print(f"{workers:>7} {len(logins) / wall:>9.1f} {failed:>6} {login_stats['p99_ms']:>12} "
+              f"{idle['p50_ms']:>11} {idle['p99_ms']:>11} {storm['p50_ms']:>12} {storm['p99_ms']:>12}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Precision/recall and lookup latency of near-duplicate path reuse on a synthetic corpus.
+
+    python benchmarks/similarity_quality.py --paths 100000 --queries 200
+
+Builds a corpus of indexed paths whose goals follow a skewed popularity (a few
+goals account for most paths, written with different spellings and
+abbreviations), then runs find_similar_path for queries derived from corpus
+entries plus some unrelated ones. Ground truth is the exact Jaccard similarity of
+the shingle sets, by brute force over same-level paths:
+
+- precision: offered paths whose true similarity is at least the threshold
+- recall: queries with a true match above the threshold that were offered one
+- best match: offered paths within 0.05 of the best true similarity
+"""
+import argparse
+import random
+import struct
+import time
+import uuid
+
+from common import create_users, make_app, summarize
+
+GOALS = [
+    ['Machine Learning Engineer', 'ML Engineer', 'machine-learning engineer', 'ML Eng'],
+    ['Data Scientist', 'data scientist', 'Data Science Specialist'],
+    ['Frontend Developer', 'Front-end Developer', 'Front End Dev', 'frontend dev'],
+    ['Backend Developer', 'Back-end Developer', 'Backend Dev'],
+    ['Full Stack Developer', 'Fullstack Developer', 'Full-Stack Dev'],
+    ['DevOps Engineer', 'DevOps Eng', 'devops engineer'],
+    ['Data Analyst', 'data analyst', 'Business Data Analyst'],
+    ['UX Designer', 'User Experience Designer', 'UX/UI Designer'],
+    ['QA Engineer', 'Quality Assurance Engineer', 'QA Eng'],
+    ['Site Reliability Engineer', 'SRE', 'site reliability eng'],
+    ['Mobile Developer', 'Mobile App Developer', 'Mobile Dev'],
+    ['Cloud Architect', 'cloud architect', 'Cloud Solutions Architect'],
+    ['Security Analyst', 'Cybersecurity Analyst', 'security analyst'],
+    ['Product Manager', 'product manager', 'Technical Product Manager'],
+    ['Database Administrator', 'DB Administrator', 'database admin'],
+    ['Game Developer', 'game dev', 'Video Game Developer'],
+    ['Embedded Engineer', 'Embedded Systems Engineer', 'embedded eng'],
+    ['AI Researcher', 'Artificial Intelligence Researcher', 'AI research scientist'],
+    ['Blockchain Developer', 'blockchain dev', 'Smart Contract Developer'],
+    ['Technical Writer', 'technical writer', 'Documentation Engineer']
+]
+TOPICS = [
+    'python', 'statistics', 'deep learning', 'computer vision', 'nlp', 'sql', 'data visualization',
+    'react', 'typescript', 'css animations', 'accessibility', 'node', 'rest apis', 'graphql', 'docker',
+    'kubernetes', 'terraform', 'monitoring', 'ci/cd', 'linux', 'networking', 'penetration testing',
+    'cryptography', 'user research', 'prototyping', 'figma', 'test automation', 'performance testing',
+    'swift', 'kotlin', 'flutter', 'aws', 'azure', 'postgres', 'query tuning', 'unity', 'c++',
+    'rust', 'solidity', 'roadmapping', 'product analytics', 'time series', 'reinforcement learning'
+]
+LEVELS = ['beginner', 'intermediate', 'advanced']
+
+def random_request(rng, goal_weights):
+    goal = rng.choice(rng.choices(GOALS, weights=goal_weights)[0])
+    interests = ', '.join(rng.sample(TOPICS, rng.randint(2, 4)))
+    return goal, interests, rng.choice(LEVELS)
+
+def perturb(rng, goal, interests, level):
+    """The same request written differently: another spelling of the goal, topics reordered or one swapped"""
+    variants = next((group for group in GOALS if goal in group), [goal])
+    topics = interests.split(', ')
+    rng.shuffle(topics)
+    if rng.random() < 0.3:
+        topics[-1] = rng.choice(TOPICS)
+    return rng.choice(variants), ', '.join(topics), level
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+def build_corpus(app, size, rng, goal_weights):
+    from skillpath.extensions import db
+    from skillpath.models import SkillPath, PathSignature, PathLshBucket
+    from skillpath.similarity import (MINHASH_PERMUTATIONS, lsh_bucket_keys, minhash_signature,
+                                      path_shingles)
+
+    create_users(app, 1, prefix='similarity')
+    user_id = 'similarity-000000'
+    corpus = []
+    with app.app_context():
+        for start in range(0, size, 2000):
+            paths, signatures, buckets = [], [], []
+            for _ in range(min(2000, size - start)):
+                goal, interests, level = random_request(rng, goal_weights)
+                path_id = str(uuid.uuid4())
+                shingles = path_shingles(goal, interests)
+                signature = minhash_signature(shingles)
+                paths.append({'id': path_id, 'user_id': user_id, 'title': f'Learning Path for {goal}',
+                              'career_goal': goal, 'current_level': level, 'interests': interests,
+                              'weekly_hours': 10, 'timeline_weeks': 12})
+                signatures.append({'skill_path_id': path_id,
+                                   'signature': struct.pack(f'>{MINHASH_PERMUTATIONS}Q', *signature)})
+                buckets += [{'id': str(uuid.uuid4()), 'bucket_key': key, 'skill_path_id': path_id}
+                            for key in lsh_bucket_keys(signature, level)]
+                corpus.append((path_id, goal, interests, level, shingles))
+            db.session.execute(SkillPath.__table__.insert(), paths)
+            db.session.execute(PathSignature.__table__.insert(), signatures)
+            db.session.execute(PathLshBucket.__table__.insert(), buckets)
+            db.session.commit()
+    return corpus
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paths', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--threshold', type=float, default=0.7)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    goal_weights = [1 / (rank + 1) for rank in range(len(GOALS))]
+    app = make_app(SIMILAR_PATH_THRESHOLD=args.threshold)
+
+    started = time.perf_counter()
+    corpus = build_corpus(app, args.paths, rng, goal_weights)
+    print(f'Indexed {len(corpus)} paths in {time.perf_counter() - started:.1f}s')
+
+    from skillpath.extensions import db
+    from skillpath.similarity import find_similar_path, path_shingles
+
+    queries = [perturb(rng, *rng.choice(corpus)[1:4]) for _ in range(int(args.queries * 0.8))]
+    queries += [random_request(rng, goal_weights) for _ in range(args.queries - len(queries))]
+
+    offered = offered_true = best_matches = with_true_match = found = 0
+    latencies = []
+    with app.app_context():
+        for goal, interests, level in queries:
+            shingles = path_shingles(goal, interests)
+            truth = {path_id: jaccard(shingles, other) for path_id, _, _, other_level, other in corpus
+                     if other_level == level}
+            best_true = max(truth.values(), default=0.0)
+            has_true_match = best_true >= args.threshold
+
+            started = time.perf_counter()
+            result = find_similar_path(goal, interests, level)
+            latencies.append(time.perf_counter() - started)
+            db.session.expunge_all()
+
+            with_true_match += has_true_match
+            if result:
+                offered += 1
+                similarity = truth[result[0].id]
+                offered_true += similarity >= args.threshold
+                best_matches += similarity >= best_true - 0.05
+                found += has_true_match
+
+    stats = summarize(latencies)
+    print(f'queries={len(queries)} with_true_match={with_true_match} offered={offered}')
+    print(f'precision={offered_true / offered if offered else 0:.3f} '
+          f'recall={found / with_true_match if with_true_match else 0:.3f} '
+          f'best_match={best_matches / offered if offered else 0:.3f}')
+    print(f"lookup latency p50={stats['p50_ms']}ms p99={stats['p99_ms']}ms max={stats['max_ms']}ms")
+
+if __name__ == '__main__':
+    main()
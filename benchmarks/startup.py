@@ -0,0 +1,105 @@
+"""Worker cold start: import time of app.py and time to the first HTTP response.
+
+    python benchmarks/startup.py --runs 5 [--tree /path/to/other/checkout]
+
+import: runs `python -X importtime -c "import app"` in a fresh interpreter and
+reports the cumulative import time of app, how many modules were loaded and
+whether openai was among them.
+
+first response: starts a fresh interpreter that imports app and serves it with
+Werkzeug, then polls GET /dashboard (a redirect to the login page, so no
+template or database is needed). Measured from process start to the first
+response, i.e. interpreter start, imports, app setup and the first request.
+
+--tree measures another checkout of the project, e.g. a git worktree of an
+older commit, so the change can be compared on the same machine.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVE = """
+import sys
+from werkzeug.serving import make_server
+import app
+make_server('127.0.0.1', int(sys.argv[1]), app.app).serve_forever()
+"""
+
+def environment():
+    """Settings that keep the worker off the network and out of the checkout's instance folder"""
+    workdir = tempfile.mkdtemp(prefix='skillpath-startup-')
+    env = dict(os.environ)
+    env.update({
+        'DATABASE_URL': f"sqlite:///{os.path.join(workdir, 'startup.sqlite3')}",
+        'SESSION_DIR': os.path.join(workdir, 'sessions'),
+        'OPENAI_API_KEY': 'sk-startup-benchmark',
+        'PYTHONDONTWRITEBYTECODE': '1'
+    })
+    return env
+
+def measure_import(tree, env):
+    """(cumulative import ms of app, modules imported, whether openai was imported)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=tree, env=env,
+                            capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        modules[name.strip()] = int(cumulative)
+    return modules['app'] / 1000, len(modules), any(name.split('.')[0] == 'openai' for name in modules)
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def measure_first_response(tree, env, timeout=60):
+    """Milliseconds from starting the worker process to its first HTTP response"""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', SERVE, str(port)], cwd=tree, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/dashboard', timeout=5).close()
+                return (time.perf_counter() - started) * 1000
+            except urllib.error.HTTPError:
+                return (time.perf_counter() - started) * 1000
+            except OSError:
+                if process.poll() is not None:
+                    raise RuntimeError(f'worker exited with status {process.returncode}')
+                time.sleep(0.005)
+        raise RuntimeError('worker did not answer in time')
+    finally:
+        process.terminate()
+        process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--tree', default=PROJECT_ROOT, help='Checkout to measure (default: this one)')
+    args = parser.parse_args()
+
+    env = environment()
+    imports = [measure_import(args.tree, env) for _ in range(args.runs)]
+    first_responses = [measure_first_response(args.tree, env) for _ in range(args.runs)]
+
+    import_ms = [ms for ms, _, _ in imports]
+    print(f'tree: {os.path.abspath(args.tree)} ({args.runs} runs, medians)')
+    print(f'import app:      {statistics.median(import_ms):8.1f} ms  (min {min(import_ms):.1f}), '
+          f'{imports[0][1]} modules, openai imported: {"yes" if imports[0][2] else "no"}')
+    print(f'first response:  {statistics.median(first_responses):8.1f} ms  (min {min(first_responses):.1f})')
+
+if __name__ == '__main__':
+    main()
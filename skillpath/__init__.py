@@ -0,0 +1,41 @@
+import os
+
+from dotenv import load_dotenv
+from flask import Flask
+
+from . import assets, feedback, scheduler, sessions
+from .cli import register_commands
+from .config import configure
+from .extensions import db, stamp_last_write
+
+# Templates and static files live at the project root, next to app.py
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def create_app():
+    """Build and configure the Flask application"""
+    # Load environment variables
+    load_dotenv()
+    
+    app = Flask(__name__,
+                root_path=PROJECT_ROOT,
+                instance_path=os.path.join(PROJECT_ROOT, 'instance'))
+    configure(app)
+    
+    db.init_app(app)
+    sessions.init_app(app)
+    scheduler.init_app(app)
+    feedback.init_app(app)
+    assets.init_app(app)
+    app.after_request(stamp_last_write)
+    
+    from .auth import bp as auth_bp
+    from .paths import bp as paths_bp
+    from .progress import bp as progress_bp
+    from .admin import bp as admin_bp
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(paths_bp)
+    app.register_blueprint(progress_bp)
+    app.register_blueprint(admin_bp)
+    
+    register_commands(app)
+    return app
@@ -0,0 +1,307 @@
+import threading
+
+from flask import Blueprint, render_template, request, jsonify, current_app, Response, stream_with_context
+from sqlalchemy import func
+
+from .auth import admin_required
+from .conditional import conditional
+from .extensions import db, db_routing_stats, read_only
+from .jobs import run_bulk_delete_resources
+from .models import Resource, StepResource, BulkJob
+from .transfer import (iter_export_records, export_ndjson_chunks, import_records, open_import_stream,
+                       iter_resource_rows, import_resources)
+
+bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+def resource_list_validators():
+    """Resource count and latest change; a count change also catches deletes"""
+    count, last_modified = db.session.query(
+        func.count(Resource.id), func.max(func.coalesce(Resource.updated_at, Resource.created_at))
+    ).one()
+    return (count, last_modified), last_modified
+
+def resource_validators(resource_id):
+    resource = db.session.query(Resource.created_at, Resource.updated_at).filter(Resource.id == resource_id).first()
+    if resource is None:
+        return None
+    last_modified = resource.updated_at or resource.created_at
+    return (resource_id, last_modified), last_modified
+
+@bp.route('/resources')
+@read_only
+@admin_required
+@conditional(resource_list_validators)
+def admin_resources():
+    resources = Resource.query.order_by(Resource.created_at.desc()).all()
+    return render_template('admin/resources.html', resources=resources)
+
+# Resource Management Routes
+@bp.route('/resources/add', methods=['POST'])
+@admin_required
+def add_resource():
+    """Add a new resource"""
+    try:
+        data = request.get_json()
+        
+        resource = Resource(
+            title=data['title'],
+            type=data['type'],
+            category=data.get('category', ''),
+            url=data.get('url', ''),
+            description=data.get('description', '')
+        )
+        
+        db.session.add(resource)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Resource added successfully!',
+            'resource': {
+                'id': resource.id,
+                'title': resource.title,
+                'type': resource.type,
+                'category': resource.category,
+                'url': resource.url,
+                'description': resource.description,
+                'created_at': resource.created_at.isoformat()
+            }
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error adding resource: {str(e)}'
+        }), 500
+
+@bp.route('/resources/<resource_id>', methods=['GET'])
+@admin_required
+@conditional(resource_validators)
+def get_resource(resource_id):
+    """Get a specific resource"""
+    try:
+        resource = Resource.query.get_or_404(resource_id)
+        
+        return jsonify({
+            'success': True,
+            'resource': {
+                'id': resource.id,
+                'title': resource.title,
+                'type': resource.type,
+                'category': resource.category,
+                'url': resource.url,
+                'description': resource.description,
+                'created_at': resource.created_at.isoformat()
+            }
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error fetching resource: {str(e)}'
+        }), 404
+
+@bp.route('/resources/<resource_id>', methods=['PUT'])
+@admin_required
+def update_resource(resource_id):
+    """Update a resource"""
+    try:
+        resource = Resource.query.get_or_404(resource_id)
+        data = request.get_json()
+        
+        resource.title = data['title']
+        resource.type = data['type']
+        resource.category = data.get('category', '')
+        resource.url = data.get('url', '')
+        resource.description = data.get('description', '')
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Resource updated successfully!',
+            'resource': {
+                'id': resource.id,
+                'title': resource.title,
+                'type': resource.type,
+                'category': resource.category,
+                'url': resource.url,
+                'description': resource.description
+            }
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error updating resource: {str(e)}'
+        }), 500
+
+@bp.route('/resources/<resource_id>', methods=['DELETE'])
+@admin_required
+def delete_resource(resource_id):
+    """Delete a resource"""
+    try:
+        resource = Resource.query.get_or_404(resource_id)
+        
+        # Delete associated step_resources first
+        StepResource.query.filter_by(resource_id=resource_id).delete()
+        
+        db.session.delete(resource)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Resource deleted successfully!'
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error deleting resource: {str(e)}'
+        }), 500
+
+@bp.route('/resources/bulk_delete', methods=['POST'])
+@admin_required
+def bulk_delete_resources():
+    """Start a background job that bulk deletes resources"""
+    try:
+        data = request.get_json()
+        resource_ids = list(dict.fromkeys(data.get('resource_ids', [])))
+        
+        if not resource_ids:
+            return jsonify({
+                'success': False,
+                'message': 'No resources selected for deletion'
+            }), 400
+        
+        job = BulkJob(kind='delete_resources', payload={'resource_ids': resource_ids}, total=len(resource_ids))
+        db.session.add(job)
+        db.session.commit()
+        
+        threading.Thread(target=run_bulk_delete_resources, args=(current_app._get_current_object(), job.id), daemon=True).start()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Deleting {len(resource_ids)} resources...',
+            'job_id': job.id
+        }), 202
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error deleting resources: {str(e)}'
+        }), 500
+
+@bp.route('/jobs/<job_id>', methods=['GET'])
+@admin_required
+def bulk_job_status(job_id):
+    """Progress of a background bulk job"""
+    job = db.session.get(BulkJob, job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'message': 'Job not found'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': {
+            'id': job.id,
+            'kind': job.kind,
+            'status': job.status,
+            'total': job.total,
+            'processed': job.processed,
+            'error': job.error
+        }
+    })
+
+@bp.route('/db_routing')
+@admin_required
+def db_routing():
+    """Report how many statements went to the primary and the replica"""
+    return jsonify({
+        'success': True,
+        'replica_configured': 'replica' in current_app.config.get('SQLALCHEMY_BINDS', {}),
+        'stats': dict(db_routing_stats)
+    })
+
+@bp.route('/analytics')
+@read_only
+@admin_required
+def admin_analytics():
+    # The analytics queries are only loaded once an admin opens the page
+    from .analytics import build_analytics_context
+    return render_template('admin/analytics.html', **build_analytics_context())
+
+@bp.route('/export')
+@admin_required
+def export_paths():
+    """Stream every path (or one user's) with steps, progress and resources as NDJSON"""
+    compress = request.args.get('gzip') == '1'
+    filename = 'skill_paths.ndjson.gz' if compress else 'skill_paths.ndjson'
+    chunks = export_ndjson_chunks(iter_export_records(request.args.get('user_id')), compress)
+    return Response(
+        stream_with_context(chunks),
+        mimetype='application/gzip' if compress else 'application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+@bp.route('/import', methods=['POST'])
+@admin_required
+def import_paths():
+    """Load an NDJSON (or .ndjson.gz) export produced by /admin/export"""
+    try:
+        upload = request.files.get('file')
+        if not upload:
+            return jsonify({
+                'success': False,
+                'message': 'No file uploaded'
+            }), 400
+        
+        counts = import_records(open_import_stream(upload.stream, upload.filename or '', 'surrogateescape'))
+        
+        return jsonify({
+            'success': True,
+            'message': 'Import completed successfully!',
+            'counts': counts
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error importing paths: {str(e)}'
+        }), 500
+
+@bp.route('/resources/import', methods=['POST'])
+@admin_required
+def import_resources_upload():
+    """Bulk import resources from a CSV or JSONL upload"""
+    try:
+        upload = request.files.get('file')
+        if not upload:
+            return jsonify({
+                'success': False,
+                'message': 'No file uploaded'
+            }), 400
+        
+        filename = upload.filename or ''
+        report = import_resources(iter_resource_rows(open_import_stream(upload.stream, filename, 'surrogateescape'), filename))
+        
+        return jsonify({
+            'success': True,
+            'message': f"{report['imported']} resources imported successfully!",
+            'report': report
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Error importing resources: {str(e)}'
+        }), 500
+
@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from .extensions import db
+from .feedback import get_rating_summaries
+from .models import User, SkillPath, PathStep, Resource, Progress, RatingAggregate
+
+def build_analytics_context():
+    """Everything the admin analytics page renders, computed from the current data"""
+    # Basic analytics data
+    total_users = User.query.count()
+    total_paths = SkillPath.query.count()
+    total_feedback = db.session.query(func.coalesce(func.sum(RatingAggregate.count), 0)).filter(
+        RatingAggregate.scope == 'goal'
+    ).scalar()
+    
+    # Calculate overall completion rate
+    total_steps = db.session.query(PathStep).count()
+    completed_steps = db.session.query(Progress).filter_by(status='done').count()
+    overall_completion_rate = round((completed_steps / total_steps * 100) if total_steps > 0 else 0, 1)
+    
+    # Top career goals
+    top_goals = db.session.query(
+        SkillPath.career_goal,
+        func.count(SkillPath.id).label('count')
+    ).group_by(SkillPath.career_goal).order_by(func.count(SkillPath.id).desc()).limit(10).all()
+    
+    # Ratings per goal, read from the maintained aggregates
+    goal_ratings = get_rating_summaries('goal', [goal.career_goal for goal in top_goals])
+    
+    # Completion rates by goal
+    completion_data = []
+    for goal in top_goals[:5]:
+        goal_paths = SkillPath.query.filter_by(career_goal=goal[0]).all()
+        goal_steps = 0
+        goal_completed = 0
+        
+        for path in goal_paths:
+            for step in path.steps:
+                goal_steps += 1
+                if step.progress and step.progress.status == 'done':
+                    goal_completed += 1
+        
+        completion_rate = round((goal_completed / goal_steps * 100) if goal_steps > 0 else 0, 1)
+        completion_data.append({
+            'goal': goal[0],
+            'completion_rate': completion_rate,
+            'total_paths': len(goal_paths),
+            'total_users': len(set([path.user_id for path in goal_paths]))
+        })
+    
+    # User growth data (last 30 days)
+    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+    user_growth = db.session.query(
+        func.date(User.created_at).label('date'),
+        func.count(User.id).label('count')
+    ).filter(User.created_at >= thirty_days_ago).group_by(
+        func.date(User.created_at)
+    ).order_by('date').all()
+    
+    # Path creation data (last 30 days)
+    path_growth = db.session.query(
+        func.date(SkillPath.created_at).label('date'),
+        func.count(SkillPath.id).label('count')
+    ).filter(SkillPath.created_at >= thirty_days_ago).group_by(
+        func.date(SkillPath.created_at)
+    ).order_by('date').all()
+    
+    # Resource usage statistics
+    total_resources = Resource.query.count()
+    resources_by_type = db.session.query(
+        Resource.type,
+        func.count(Resource.id).label('count')
+    ).group_by(Resource.type).all()
+    
+    # User engagement metrics - FIXED QUERY
+    seven_days_ago = datetime.utcnow() - timedelta(days=7)
+    active_users_query = db.session.query(
+        func.count(func.distinct(SkillPath.user_id))
+    ).join(PathStep).join(Progress).filter(
+        Progress.updated_at >= seven_days_ago
+    )
+    active_users_count = active_users_query.scalar() or 0
+    
+    # Alternative simpler approach for active users (users with any activity in last 7 days)
+    # This counts users who have created paths or updated progress in the last 7 days
+    recent_path_users = db.session.query(
+        func.count(func.distinct(SkillPath.user_id))
+    ).filter(SkillPath.created_at >= seven_days_ago).scalar() or 0
+    
+    recent_progress_users = db.session.query(
+        func.count(func.distinct(SkillPath.user_id))
+    ).join(PathStep).join(Progress).filter(
+        Progress.updated_at >= seven_days_ago
+    ).scalar() or 0
+    
+    active_users = recent_path_users + recent_progress_users
+    
+    # Recent activity data
+    recent_paths = SkillPath.query.order_by(SkillPath.created_at.desc()).limit(5).all()
+    recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
+    
+    # Platform insights - Fixed queries using Python calculations
+    # Calculate average steps per path in Python
+    all_paths = SkillPath.query.all()
+    total_steps_all_paths = sum(len(path.steps) for path in all_paths)
+    avg_steps_per_path = total_steps_all_paths / len(all_paths) if all_paths else 0
+    
+    # Calculate average resources per step in Python
+    all_steps = PathStep.query.all()
+    total_resources_all_steps = sum(len(step.step_resources) for step in all_steps)
+    avg_resources_per_step = total_resources_all_steps / len(all_steps) if all_steps else 0
+    
+    # Trending skills (based on recent path creation)
+    trending_skills = db.session.query(
+        SkillPath.career_goal,
+        func.count(SkillPath.id).label('count')
+    ).filter(
+        SkillPath.created_at >= datetime.utcnow() - timedelta(days=30)
+    ).group_by(SkillPath.career_goal).order_by(
+        func.count(SkillPath.id).desc()
+    ).limit(5).all()
+    
+    # Calculate completion rates for trending skills
+    trending_skills_with_completion = []
+    for skill in trending_skills:
+        skill_paths = SkillPath.query.filter_by(career_goal=skill.career_goal).all()
+        total_skill_steps = 0
+        completed_skill_steps = 0
+        
+        for path in skill_paths:
+            for step in path.steps:
+                total_skill_steps += 1
+                if step.progress and step.progress.status == 'done':
+                    completed_skill_steps += 1
+        
+        completion_rate = round((completed_skill_steps / total_skill_steps * 100) if total_skill_steps > 0 else 0, 1)
+        
+        trending_skills_with_completion.append({
+            'career_goal': skill.career_goal,
+            'count': skill.count,
+            'completion_rate': completion_rate
+        })
+    
+    # Get current timestamp for the template
+    now = datetime.utcnow()
+    
+    return {
+        'total_users': total_users,
+        'total_paths': total_paths,
+        'total_feedback': total_feedback,
+        'overall_completion_rate': overall_completion_rate,
+        'top_goals': top_goals,
+        'goal_ratings': goal_ratings,
+        'completion_data': completion_data,
+        'user_growth': user_growth,
+        'path_growth': path_growth,
+        'total_resources': total_resources,
+        'resources_by_type': resources_by_type,
+        'active_users': active_users,
+        'recent_paths': recent_paths,
+        'recent_users': recent_users,
+        'avg_steps_per_path': round(avg_steps_per_path, 1),
+        'avg_resources_per_step': round(avg_resources_per_step, 1),
+        'trending_skills': trending_skills_with_completion,
+        'now': now
+    }
@@ -0,0 +1,188 @@
+"""Async serving mode: generations wait on the LLM as coroutines instead of threads.
+
+POST /generate_path runs as a coroutine. Its database work (validation and the
+similar-path lookup before the LLM call, saving the path after it) runs as
+ordinary Flask requests on a small thread pool, so no thread is held while the
+LLM answers. Every other route is served by the WSGI app on its own thread pool.
+"""
+import io
+import sys
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from a2wsgi import WSGIMiddleware
+
+from .auth import login_required
+from .generation import upgrade_when_ready
+from .llm import acall_openai_api
+from .paths import prepare_generation, queue_timeout, finish_generation
+
+def build_environ(scope, body):
+    """WSGI environ for an ASGI HTTP request whose body has been read in full"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_LENGTH':
+            continue
+        key = name if name == 'CONTENT_TYPE' else f'HTTP_{name}'
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+class AsyncApp:
+    """ASGI application around the Flask app; see the module docstring"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.wsgi = WSGIMiddleware(app, workers=app.config['ASYNC_ROUTE_WORKERS'])
+        self.db_pool = ThreadPoolExecutor(max_workers=app.config['ASYNC_DB_WORKERS'], thread_name_prefix='async-db')
+        # Generations that missed their deadline but may still upgrade a path; the loop only keeps weak references
+        self.late_generations = set()
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http' and scope['method'] == 'POST' and scope['path'] == '/generate_path':
+            await self.generate_path(scope, receive, send)
+        else:
+            await self.wsgi(scope, receive, send)
+    
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.db_pool.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    
+    def run_step(self, environ, step, *args):
+        """Run one part of a generation as a full Flask request (hooks, session save).
+        
+        Returns (status, headers, body), or the generation request when the step
+        hands over to the LLM without answering.
+        """
+        app = self.app
+        with app.request_context(environ):
+            try:
+                try:
+                    rv = app.preprocess_request()
+                    if rv is None:
+                        rv = step(*args)
+                        if isinstance(rv, dict):
+                            return rv
+                except Exception as e:
+                    rv = app.handle_user_exception(e)
+                response = app.finalize_request(rv)
+            except Exception as e:
+                response = app.handle_exception(e)
+            
+            captured = {}
+            def start_response(status, headers, exc_info=None):
+                captured['status'] = int(status.split(' ', 1)[0])
+                captured['headers'] = headers
+            body = b''.join(response(environ, start_response))
+            return captured['status'], captured['headers'], body
+    
+    async def step(self, scope, body, step, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.db_pool, self.run_step, build_environ(scope, body), step, *args)
+    
+    async def call_llm(self, prompt):
+        with self.app.app_context():
+            return await acall_openai_api(prompt)
+    
+    def start_upgrade(self, pending, skill_path_id):
+        """Done-callback: write the late AI result from the thread pool, off the event loop"""
+        if not pending.cancelled():
+            self.db_pool.submit(upgrade_when_ready, self.app, skill_path_id, pending)
+    
+    async def generate_path(self, scope, receive, send):
+        body = await read_body(receive)
+        if body is None:
+            return
+        
+        generation = await self.step(scope, body, login_required(prepare_generation))
+        if not isinstance(generation, dict):
+            await self.send_response(send, *generation)
+            return
+        
+        ai_response = None
+        pending = None
+        with self.app.app_context():
+            timeout = queue_timeout(generation)
+        admitted = await self.app.extensions['generation_scheduler'].acquire_async(
+            generation['user_id'], generation['cost'], 'interactive', timeout
+        )
+        if admitted:
+            pending = asyncio.ensure_future(self.call_llm(generation['prompt']))
+            await asyncio.wait([pending], timeout=max(0, generation['deadline'] - time.monotonic()))
+            if pending.done():
+                ai_response = pending.result()
+                pending = None
+        else:
+            logging.info("Generation queue wait exceeded the generation deadline")
+        
+        upgrade = None
+        if pending and self.app.config['GENERATION_BACKGROUND_UPGRADE']:
+            loop = asyncio.get_running_loop()
+            self.late_generations.add(pending)
+            pending.add_done_callback(self.late_generations.discard)
+            # finish_generation runs on a pool thread; callbacks are added on the loop
+            upgrade = lambda skill_path_id: loop.call_soon_threadsafe(
+                pending.add_done_callback, lambda done: self.start_upgrade(done, skill_path_id)
+            )
+        elif pending:
+            pending.cancel()
+        
+        response = await self.step(scope, body, finish_generation, generation, ai_response,
+                                   ai_response is not None, upgrade)
+        await self.send_response(send, *response)
+    
+    async def send_response(self, send, status, headers, body):
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+def create_asgi_app(app=None):
+    """ASGI app for uvicorn; builds the Flask app unless one is given"""
+    if app is None:
+        from . import create_app
+        app = create_app()
+    return AsyncApp(app)
@@ -0,0 +1,105 @@
+import os
+import re
+import gzip
+import json
+import hashlib
+
+from flask import current_app, request, url_for, send_from_directory
+
+# Assets built by `flask build-assets` into static/dist with content-hashed names
+BUILT_ASSETS = ['css/style.css', 'css/admin.css', 'js/main.js', 'js/admin.js']
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+def load_asset_manifest():
+    manifest = current_app.extensions.get('asset_manifest')
+    if manifest is None:
+        try:
+            with open(os.path.join(current_app.static_folder, 'dist', 'manifest.json')) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        current_app.extensions['asset_manifest'] = manifest
+    return manifest
+
+def asset_url(filename):
+    """URL of the fingerprinted build of a static asset, or the raw file if it has not been built"""
+    return url_for('static', filename=load_asset_manifest().get(filename, filename))
+
+def minify_css(source):
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    return source.replace(';}', '}').strip()
+
+def minify_js(source):
+    """Minify with rjsmin when installed; otherwise only strip blank lines and trailing whitespace"""
+    try:
+        import rjsmin
+        return rjsmin.jsmin(source)
+    except ImportError:
+        return '\n'.join(line.rstrip() for line in source.splitlines() if line.strip()) + '\n'
+
+def build_assets():
+    """Minify, fingerprint and precompress CSS/JS into static/dist"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    
+    static_folder = current_app.static_folder
+    dist = os.path.join(static_folder, 'dist')
+    manifest = {}
+    for filename in BUILT_ASSETS:
+        with open(os.path.join(static_folder, filename), encoding='utf-8') as f:
+            source = f.read()
+        
+        minified = (minify_css(source) if filename.endswith('.css') else minify_js(source)).encode('utf-8')
+        digest = hashlib.sha256(minified).hexdigest()[:10]
+        name, ext = os.path.splitext(filename)
+        built = f'{name}.{digest}{ext}'
+        
+        path = os.path.join(dist, built)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(minified)
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(minified, 9))
+        sizes = f'{len(source.encode("utf-8"))} raw, {len(minified)} minified, {os.path.getsize(path + ".gz")} gzip'
+        if brotli:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(minified, quality=11))
+            sizes += f', {os.path.getsize(path + ".br")} brotli'
+        
+        manifest[filename] = f'dist/{built}'
+        print(f'{filename} -> dist/{built} ({sizes} bytes)')
+    
+    with open(os.path.join(dist, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    current_app.extensions['asset_manifest'] = manifest
+
+def built_asset(filename):
+    """Serve fingerprinted assets with immutable caching, precompressed when the client allows"""
+    dist = os.path.join(current_app.static_folder, 'dist')
+    
+    # Quality values count: "gzip;q=0" means the client refuses gzip
+    encoding = None
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[candidate] > 0 and os.path.isfile(os.path.join(dist, filename + suffix)):
+            encoding = candidate
+            break
+    
+    if encoding:
+        mimetype = 'text/css' if filename.endswith('.css') else 'application/javascript'
+        response = send_from_directory(dist, filename + ('.br' if encoding == 'br' else '.gz'),
+                                       mimetype=mimetype, max_age=ASSET_MAX_AGE)
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = send_from_directory(dist, filename, max_age=ASSET_MAX_AGE)
+    
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    return response
+
+def init_app(app):
+    app.add_url_rule('/static/dist/<path:filename>', 'built_asset', built_asset)
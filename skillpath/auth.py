@@ -0,0 +1,203 @@
+import json
+import threading
+from functools import wraps
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, current_app, has_app_context
+from sqlalchemy import event, inspect
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from .extensions import db, RoutingSession
+from .models import User
+
+bp = Blueprint('auth', __name__)
+
+# Password Hashing
+password_hash_pool = None
+password_hash_slots = None
+password_hash_pool_lock = threading.Lock()
+
+def run_password_job(func, *args, **kwargs):
+    """Run a CPU-heavy hashing call in the bounded process pool"""
+    global password_hash_pool, password_hash_slots
+    if current_app.config['PASSWORD_HASH_WORKERS'] <= 0:
+        return func(*args, **kwargs)
+    
+    with password_hash_pool_lock:
+        if password_hash_pool is None:
+            password_hash_pool = ProcessPoolExecutor(max_workers=current_app.config['PASSWORD_HASH_WORKERS'])
+            password_hash_slots = threading.BoundedSemaphore(current_app.config['PASSWORD_HASH_MAX_PENDING'])
+    
+    with password_hash_slots:
+        return password_hash_pool.submit(func, *args, **kwargs).result()
+
+def hash_password(password):
+    return run_password_job(generate_password_hash, password, method=current_app.config['PASSWORD_HASH_METHOD'])
+
+def verify_password(password_hash, password):
+    return run_password_job(check_password_hash, password_hash, password)
+
+# Werkzeug expands method strings ('scrypt' -> 'scrypt:32768:8:1'), so compare against a real hash's prefix
+configured_hash_prefixes = {}
+
+def configured_hash_prefix():
+    method = current_app.config['PASSWORD_HASH_METHOD']
+    if method not in configured_hash_prefixes:
+        configured_hash_prefixes[method] = hash_password('').split('$', 1)[0]
+    return configured_hash_prefixes[method]
+
+def password_needs_rehash(password_hash):
+    """True when a stored hash was made with a different method or cost than configured"""
+    return password_hash.split('$', 1)[0] != configured_hash_prefix()
+
+# Cached Principals
+def get_principal(user_id):
+    """Return the cached {id, username, is_admin} record, reading the user only on a miss"""
+    store = current_app.extensions['session_store']
+    key = f'principal:{user_id}'
+    cached = store.get(key)
+    if cached is not None:
+        return json.loads(cached)
+    
+    user = db.session.get(User, user_id)
+    if not user:
+        return None
+    
+    principal = {'id': user.id, 'username': user.username, 'is_admin': bool(user.is_admin)}
+    store.set(key, json.dumps(principal), current_app.config['PRINCIPAL_TTL_SECONDS'])
+    return principal
+
+def invalidate_principal(user_id):
+    current_app.extensions['session_store'].delete(f'principal:{user_id}')
+
+@event.listens_for(RoutingSession, 'after_flush')
+def collect_changed_principals(db_session, flush_context):
+    """Remember users whose admin flag changed or who were deleted in this transaction"""
+    changed = db_session.info.setdefault('changed_principals', set())
+    for obj in db_session.dirty:
+        if isinstance(obj, User) and inspect(obj).attrs.is_admin.history.has_changes():
+            changed.add(obj.id)
+    changed.update(obj.id for obj in db_session.deleted if isinstance(obj, User))
+
+@event.listens_for(RoutingSession, 'after_commit')
+def invalidate_changed_principals(db_session):
+    """Drop their cached principals only once the change is committed.
+    
+    Invalidating earlier would let a concurrent request re-cache the old flag from
+    the database before the commit lands.
+    """
+    changed = db_session.info.pop('changed_principals', None)
+    if changed and has_app_context():
+        for user_id in changed:
+            invalidate_principal(user_id)
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def discard_changed_principals(db_session):
+    db_session.info.pop('changed_principals', None)
+
+# Authentication Decorators
+def login_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            flash('Please log in to access this page.', 'error')
+            return redirect(url_for('auth.login'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            flash('Please log in to access this page.', 'error')
+            return redirect(url_for('auth.login'))
+        
+        principal = get_principal(session['user_id'])
+        if not principal or not principal['is_admin']:
+            flash('Admin access required.', 'error')
+            return redirect(url_for('paths.dashboard'))
+        
+        return f(*args, **kwargs)
+    return decorated_function
+
+# Routes
+@bp.route('/signup', methods=['GET', 'POST'])
+def signup():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        email = request.form.get('email')
+        password = request.form.get('password')
+        confirm_password = request.form.get('confirm_password')
+        
+        # Basic validation
+        if not all([username, email, password, confirm_password]):
+            flash('All fields are required.', 'error')
+            return render_template('signup.html')
+        
+        if password != confirm_password:
+            flash('Passwords do not match.', 'error')
+            return render_template('signup.html')
+        
+        if User.query.filter_by(username=username).first():
+            flash('Username already exists.', 'error')
+            return render_template('signup.html')
+        
+        if User.query.filter_by(email=email).first():
+            flash('Email already registered.', 'error')
+            return render_template('signup.html')
+        
+        # Hashing can queue behind other logins; don't hold a pooled connection meanwhile
+        db.session.close()
+        password_hash = hash_password(password)
+        
+        # Create user
+        user = User(
+            username=username,
+            email=email,
+            password_hash=password_hash
+        )
+        
+        db.session.add(user)
+        db.session.commit()
+        
+        flash('Account created successfully! Please log in.', 'success')
+        return redirect(url_for('auth.login'))
+    
+    return render_template('signup.html')
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        
+        user = User.query.filter_by(username=username).first()
+        # Verification can queue behind other logins; don't hold a pooled connection meanwhile
+        if user:
+            db.session.expunge(user)
+        db.session.close()
+        
+        if user and verify_password(user.password_hash, password):
+            if password_needs_rehash(user.password_hash):
+                user.password_hash = hash_password(password)
+                db.session.add(user)
+                db.session.commit()
+            
+            # A fresh session id, so one planted before login never becomes authenticated
+            session.regenerate()
+            session['user_id'] = user.id
+            session['username'] = user.username
+            session['is_admin'] = user.is_admin
+            flash('Login successful!', 'success')
+            return redirect(url_for('paths.dashboard'))
+        else:
+            flash('Invalid username or password.', 'error')
+    
+    return render_template('login.html')
+
+@bp.route('/logout')
+def logout():
+    session.clear()
+    session.regenerate()
+    flash('You have been logged out.', 'success')
+    return redirect(url_for('paths.index'))
@@ -0,0 +1,179 @@
+import gc
+import sys
+import json
+import tracemalloc
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func
+
+from .assets import build_assets
+from .extensions import db
+from .feedback import compare_rating_aggregates, rebuild_rating_aggregates
+from .models import SkillPath, GeneratedContent
+from .schema import ensure_content_hash_column
+from .similarity import index_skill_path
+from .transfer import (iter_export_records, export_ndjson_chunks, import_records, open_import_stream,
+                       iter_resource_rows, import_resources, canonicalize_resource_urls)
+
+def loaded_bytes(query):
+    """Python memory held by the objects a query loads"""
+    db.session.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        rows = query.all()
+        held, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del rows
+    db.session.expunge_all()
+    return held
+
+def skill_paths_size():
+    if db.engine.dialect.name == 'postgresql':
+        return db.session.execute(db.text("SELECT pg_size_pretty(pg_total_relation_size('skill_paths'))")).scalar()
+    return None
+
+@click.command('compact-generated-content')
+@with_appcontext
+@click.option('--memory-sample', default=1000, help='Paths loaded before and after to report memory per path')
+def compact_generated_content(memory_sample):
+    """Move uncompressed generated_content into deduplicated, compressed storage"""
+    db.create_all()
+    ensure_content_hash_column()
+    
+    # Earlier runs cleared migrated rows to the JSON text 'null' instead of SQL NULL
+    repaired = SkillPath.query.filter(
+        SkillPath.content_hash.isnot(None),
+        SkillPath.legacy_generated_content.isnot(None)
+    ).update({SkillPath.legacy_generated_content: db.null()}, synchronize_session=False)
+    db.session.commit()
+    
+    size_before = skill_paths_size()
+    sample_ids = [row[0] for row in db.session.query(SkillPath.id).filter(
+        SkillPath.content_hash.is_(None),
+        SkillPath.legacy_generated_content.isnot(None)
+    ).limit(memory_sample)]
+    # Before: the AI JSON was an ordinary column, loaded with every path
+    memory_before = loaded_bytes(SkillPath.query.filter(SkillPath.id.in_(sample_ids)).options(
+        db.undefer(SkillPath.legacy_generated_content)))
+    
+    before_bytes = 0
+    migrated = 0
+    while True:
+        batch = SkillPath.query.filter(
+            SkillPath.content_hash.is_(None),
+            SkillPath.legacy_generated_content.isnot(None)
+        ).options(db.undefer(SkillPath.legacy_generated_content)).limit(500).all()
+        if not batch:
+            break
+        
+        for skill_path in batch:
+            before_bytes += len(json.dumps(skill_path.legacy_generated_content).encode('utf-8'))
+            skill_path.generated_content = skill_path.legacy_generated_content
+            skill_path.legacy_generated_content = None
+            db.session.flush()
+            migrated += 1
+        
+        db.session.commit()
+    
+    memory_after = loaded_bytes(SkillPath.query.filter(SkillPath.id.in_(sample_ids)))
+    
+    after_bytes = db.session.query(func.coalesce(func.sum(func.length(GeneratedContent.data)), 0)).scalar()
+    unique_contents = GeneratedContent.query.count()
+    print(f'Migrated {migrated} paths into {unique_contents} stored contents')
+    if repaired:
+        print(f'Cleared {repaired} previously migrated rows to SQL NULL')
+    print(f'generated_content bytes: {before_bytes} before, {after_bytes} after (all compressed rows)')
+    if sample_ids:
+        print(f'Memory to load a path (SkillPath.query.all(), {len(sample_ids)} paths sampled): '
+              f'{memory_before // len(sample_ids)} bytes before, {memory_after // len(sample_ids)} after')
+    
+    if size_before:
+        print(f'skill_paths total size: {size_before} before, {skill_paths_size()} after '
+              f'(run VACUUM FULL skill_paths to reclaim freed space)')
+
+@click.command('index-similar-paths')
+@with_appcontext
+def index_similar_paths():
+    """Build MinHash signatures and LSH buckets for paths created before similarity reuse"""
+    db.create_all()
+    indexed = 0
+    while True:
+        batch = SkillPath.query.filter(~SkillPath.signature.has()).limit(500).all()
+        if not batch:
+            break
+        for skill_path in batch:
+            index_skill_path(skill_path)
+            indexed += 1
+        db.session.commit()
+    print(f'Indexed {indexed} paths')
+
+@click.command('export-paths')
+@with_appcontext
+@click.option('--output', '-o', default='-', help='File to write, or - for stdout')
+@click.option('--gzip', 'compress', is_flag=True, help='Gzip-compress the output')
+@click.option('--user-id', default=None, help='Only export this user\'s paths')
+def export_paths_command(output, compress, user_id):
+    """Stream paths, steps, progress and resources as NDJSON"""
+    out = sys.stdout.buffer if output == '-' else open(output, 'wb')
+    try:
+        for chunk in export_ndjson_chunks(iter_export_records(user_id), compress):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+@click.command('import-paths')
+@with_appcontext
+@click.argument('path')
+def import_paths_command(path):
+    """Bulk-load an NDJSON (or .ndjson.gz) export"""
+    with open(path, 'rb') as f:
+        counts = import_records(open_import_stream(f, path, 'surrogateescape'))
+    print(json.dumps(counts, indent=2))
+
+@click.command('import-resources')
+@with_appcontext
+@click.argument('path')
+def import_resources_command(path):
+    """Bulk import resources from a CSV or JSONL file (.gz accepted)"""
+    with open(path, 'rb') as f:
+        report = import_resources(iter_resource_rows(open_import_stream(f, path, 'surrogateescape'), path))
+    print(json.dumps(report, indent=2))
+
+@click.command('canonicalize-resource-urls')
+@with_appcontext
+def canonicalize_resource_urls_command():
+    """Store existing resource URLs in canonical form, merging resources that share one"""
+    rewritten, merged = canonicalize_resource_urls()
+    print(f'Rewrote {rewritten} resource URLs, merged {merged} duplicate resources')
+
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+    """Minify, fingerprint and precompress CSS/JS into static/dist"""
+    build_assets()
+
+@click.command('backfill-rating-aggregates')
+@with_appcontext
+@click.option('--check', is_flag=True, help='Only compare the stored aggregates with a full recount')
+def backfill_rating_aggregates(check):
+    """Rebuild per-path and per-goal rating aggregates from the feedback table"""
+    db.create_all()
+    if not check:
+        print(f'Rebuilt {rebuild_rating_aggregates()} rating aggregates')
+    
+    mismatched = compare_rating_aggregates()
+    for scope, key in mismatched[:20]:
+        print(f'Mismatch: {scope} {key}')
+    print(f'{len(mismatched)} aggregates differ from a full recount')
+    if mismatched:
+        sys.exit(1)
+
+def register_commands(app):
+    for command in (compact_generated_content, index_similar_paths, export_paths_command,
+                    import_paths_command, import_resources_command, canonicalize_resource_urls_command,
+                    build_assets_command, backfill_rating_aggregates):
+        app.cli.add_command(command)
@@ -0,0 +1,56 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, request, session
+from werkzeug.http import is_resource_modified
+
+from .assets import load_asset_manifest
+
+def make_etag(parts):
+    """Strong ETag over the caller's validator values, the user and the deployed assets"""
+    seed = repr((current_app.config['ETAG_SALT'], session.get('user_id'), sorted(load_asset_manifest().items()), parts))
+    return hashlib.sha256(seed.encode('utf-8')).hexdigest()[:32]
+
+def set_private_validators(response, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    # Per-user content: browsers may keep it but must revalidate, shared caches must not store it
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    return response
+
+def latest(*timestamps):
+    """Most recent of the given timestamps, ignoring missing ones"""
+    return max((t for t in timestamps if t), default=None)
+
+def conditional(validators):
+    """Answer 304 Not Modified when the client's copy of a view is still current.
+
+    ``validators(**view_args)`` returns ``(parts, last_modified)`` from cheap
+    aggregate queries, or None to always run the view (e.g. not found)."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # A page carrying a flash message is rendered once and never reused
+            if '_flashes' in session:
+                response = current_app.make_response(f(*args, **kwargs))
+                response.cache_control.no_store = True
+                return response
+            
+            found = validators(**kwargs)
+            if found is None:
+                return f(*args, **kwargs)
+            
+            parts, last_modified = found
+            etag = make_etag(parts)
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                return set_private_validators(current_app.response_class(status=304), etag, last_modified)
+            
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                set_private_validators(response, etag, last_modified)
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,54 @@
+import time
+from collections import defaultdict
+from functools import wraps
+
+from flask import current_app, g, has_request_context, session
+from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
+from sqlalchemy import event
+
+# Statements routed to each database, exposed at /admin/db_routing
+db_routing_stats = defaultdict(int)
+
+class RoutingSession(FlaskSQLAlchemySession):
+    """Session that sends reads from read-only routes to the replica"""
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_request_context() and g.get('use_replica'):
+            db_routing_stats['replica'] += 1
+            return self._db.engines['replica']
+        
+        db_routing_stats['primary'] += 1
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+@event.listens_for(RoutingSession, 'after_flush')
+def record_write(session, flush_context):
+    """Remember that this request wrote, so the user's next reads stay on the primary"""
+    if has_request_context():
+        g.db_wrote = True
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+def replica_available():
+    """True when a replica is configured and the user has not written recently"""
+    if 'replica' not in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        return False
+    
+    last_write_at = session.get('last_write_at', 0)
+    if time.time() - last_write_at < current_app.config['REPLICA_STICKY_SECONDS']:
+        db_routing_stats['sticky'] += 1
+        return False
+    
+    return True
+
+def read_only(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.use_replica = replica_available()
+        return f(*args, **kwargs)
+    return decorated_function
+
+def stamp_last_write(response):
+    if g.get('db_wrote'):
+        session['last_write_at'] = time.time()
+    return response
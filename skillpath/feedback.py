@@ -0,0 +1,250 @@
+import time
+import uuid
+import atexit
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import func, case, tuple_
+from sqlalchemy.exc import OperationalError, InterfaceError, TimeoutError as PoolTimeoutError
+
+from .extensions import db
+from .models import SkillPath, Feedback, RatingAggregate
+
+COUNTER_COLUMNS = ['count', 'total', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+# Failures that say nothing about the entries themselves (database down, locked or out of connections)
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError)
+
+def goal_key(career_goal):
+    """Career goals are free text; aggregate them case- and whitespace-insensitively"""
+    return ' '.join((career_goal or '').lower().split())[:200]
+
+def add_rating(counters, rating, sign=1):
+    """Add (or with sign=-1, remove) one rating to a dict of counter deltas"""
+    counters['count'] += sign
+    counters['total'] += sign * rating
+    counters[f'rating_{rating}'] += sign
+
+def upsert_aggregates(deltas):
+    """Add counter deltas to rating_aggregates, creating rows as needed, in one statement"""
+    now = datetime.utcnow()
+    rows = [dict(scope=scope, scope_key=key, updated_at=now, **counters) for (scope, key), counters in deltas.items()]
+    table = RatingAggregate.__table__
+    
+    dialect = db.session.connection().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for row in rows:
+            aggregate = db.session.get(RatingAggregate, (row['scope'], row['scope_key']))
+            if aggregate is None:
+                db.session.add(RatingAggregate(**row))
+            else:
+                for column in COUNTER_COLUMNS:
+                    setattr(aggregate, column, getattr(aggregate, column) + row[column])
+        return
+    
+    stmt = insert(table)
+    updates = {column: table.c[column] + stmt.excluded[column] for column in COUNTER_COLUMNS}
+    updates['updated_at'] = stmt.excluded.updated_at
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['scope', 'scope_key'], set_=updates), rows)
+
+def apply_feedback(entries):
+    """Store a batch of ratings, one per user and path, and fold the changes into the aggregates in the same transaction.
+    
+    Rating a path again replaces the earlier rating, so the aggregates get the difference.
+    """
+    # Within a batch, a user's later rating of a path wins
+    latest = {(entry['user_id'], entry['skill_path_id']): entry for entry in entries}
+    existing = {
+        (row.user_id, row.skill_path_id): row
+        for row in Feedback.query.filter(
+            tuple_(Feedback.user_id, Feedback.skill_path_id).in_(list(latest))
+        ).with_for_update()
+    }
+    
+    deltas = defaultdict(lambda: dict.fromkeys(COUNTER_COLUMNS, 0))
+    new_rows = []
+    for pair, entry in latest.items():
+        keys = (('path', entry['skill_path_id']), ('goal', goal_key(entry['career_goal'])))
+        row = existing.get(pair)
+        for key in keys:
+            add_rating(deltas[key], entry['rating'])
+            if row is not None:
+                add_rating(deltas[key], row.rating, sign=-1)
+        
+        if row is None:
+            new_rows.append({column: entry[column]
+                             for column in ('id', 'user_id', 'skill_path_id', 'rating', 'comment', 'created_at')})
+        else:
+            row.rating = entry['rating']
+            row.comment = entry['comment']
+    
+    if new_rows:
+        db.session.execute(Feedback.__table__.insert(), new_rows)
+    changed = {key: counters for key, counters in deltas.items() if any(counters.values())}
+    if changed:
+        upsert_aggregates(changed)
+    db.session.commit()
+
+class FeedbackBuffer:
+    """Collects submitted feedback and writes it in batches from a background thread"""
+    
+    def __init__(self, app, batch_size, flush_seconds, max_attempts=5, max_pending=10000):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_attempts = max_attempts
+        self.max_pending = max_pending
+        self._cond = threading.Condition()
+        self._pending = []
+        self._thread = None
+    
+    def submit(self, user_id, skill_path, rating, comment):
+        """Queue a rating; False if the queue is full because writes keep failing"""
+        entry = {
+            'id': str(uuid.uuid4()),
+            'user_id': user_id,
+            'skill_path_id': skill_path.id,
+            'career_goal': skill_path.career_goal,
+            'rating': rating,
+            'comment': comment,
+            'created_at': datetime.utcnow()
+        }
+        if self.batch_size <= 1:
+            apply_feedback([entry])
+            return True
+        
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                return False
+            self._pending.append(entry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='feedback-writer', daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+        return True
+    
+    def flush(self):
+        with self._cond:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._write(batch)
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self._pending) >= self.batch_size, timeout=self.flush_seconds)
+                batch, self._pending = self._pending, []
+            # Back off before retrying entries that failed
+            if batch and not self._write(batch):
+                time.sleep(self.flush_seconds)
+    
+    def _apply(self, batch):
+        with self.app.app_context():
+            try:
+                apply_feedback(batch)
+            except Exception as e:
+                db.session.rollback()
+                return e
+        return None
+    
+    def _write(self, batch):
+        """Write a batch, isolating entries that cannot be written; False if some must be retried"""
+        error = self._apply(batch)
+        if error is None:
+            return True
+        
+        # Halve a rejected batch until the bad entries are alone, so the rest still gets written
+        if not isinstance(error, TRANSIENT_ERRORS) and len(batch) > 1:
+            middle = len(batch) // 2
+            first_written = self._write(batch[:middle])
+            return self._write(batch[middle:]) and first_written
+        
+        self._retry_later(batch, error)
+        return False
+    
+    def _retry_later(self, batch, error):
+        """Requeue entries under max_attempts; drop and log the rest"""
+        retry, dropped = [], []
+        for entry in batch:
+            entry['attempts'] = entry.get('attempts', 0) + 1
+            (retry if entry['attempts'] < self.max_attempts else dropped).append(entry)
+        
+        if dropped:
+            logging.error(f"Dropping {len(dropped)} feedback entries after {self.max_attempts} failed attempts: {str(error)}")
+        if retry:
+            logging.warning(f"Writing {len(retry)} feedback entries failed, retrying: {str(error)}")
+            with self._cond:
+                self._pending[:0] = retry
+
+def rating_summary(aggregate):
+    if aggregate is None:
+        return {'count': 0, 'average': None, 'histogram': [0] * 5}
+    return {'count': aggregate.count, 'average': aggregate.average, 'histogram': aggregate.histogram}
+
+def get_rating_summary(scope, key):
+    """Rating count, average and histogram for one path or goal (a primary-key lookup)"""
+    if scope == 'goal':
+        key = goal_key(key)
+    return rating_summary(db.session.get(RatingAggregate, (scope, key)))
+
+def get_rating_summaries(scope, keys):
+    """rating_summary for several paths or goals in one query, keyed as given"""
+    lookup = {(goal_key(key) if scope == 'goal' else key): key for key in keys}
+    aggregates = RatingAggregate.query.filter(
+        RatingAggregate.scope == scope, RatingAggregate.scope_key.in_(list(lookup))
+    ).all()
+    found = {lookup[aggregate.scope_key]: aggregate for aggregate in aggregates}
+    return {key: rating_summary(found.get(key)) for key in keys}
+
+def recount_rating_aggregates():
+    """Compute every aggregate from scratch with GROUP BY over the feedback table"""
+    counters = [func.count(Feedback.id), func.coalesce(func.sum(Feedback.rating), 0)] + [
+        func.sum(case((Feedback.rating == rating, 1), else_=0)) for rating in range(1, 6)
+    ]
+    recount = defaultdict(lambda: dict.fromkeys(COUNTER_COLUMNS, 0))
+    
+    path_rows = db.session.query(Feedback.skill_path_id, *counters).filter(
+        Feedback.skill_path_id.isnot(None)
+    ).group_by(Feedback.skill_path_id)
+    goal_rows = db.session.query(SkillPath.career_goal, *counters).join(
+        SkillPath, SkillPath.id == Feedback.skill_path_id
+    ).group_by(SkillPath.career_goal)
+    
+    for scope, rows in (('path', path_rows), ('goal', goal_rows)):
+        for key, *values in rows:
+            # Goals differing only in case or spacing fold into one aggregate
+            target = recount[(scope, goal_key(key) if scope == 'goal' else key)]
+            for column, value in zip(COUNTER_COLUMNS, values):
+                target[column] += int(value or 0)
+    return dict(recount)
+
+def compare_rating_aggregates():
+    """Keys whose stored aggregate differs from a full recount"""
+    recount = recount_rating_aggregates()
+    stored = {
+        (aggregate.scope, aggregate.scope_key): {column: getattr(aggregate, column) for column in COUNTER_COLUMNS}
+        for aggregate in RatingAggregate.query
+    }
+    empty = dict.fromkeys(COUNTER_COLUMNS, 0)
+    return sorted(key for key in set(recount) | set(stored) if recount.get(key, empty) != stored.get(key, empty))
+
+def rebuild_rating_aggregates():
+    """Replace all aggregates with a full recount; returns the number of aggregate rows"""
+    recount = recount_rating_aggregates()
+    RatingAggregate.query.delete()
+    if recount:
+        upsert_aggregates(recount)
+    db.session.commit()
+    return len(recount)
+
+def init_app(app):
+    buffer = FeedbackBuffer(app, app.config['FEEDBACK_BATCH_SIZE'], app.config['FEEDBACK_FLUSH_SECONDS'],
+                            app.config['FEEDBACK_MAX_ATTEMPTS'], app.config['FEEDBACK_MAX_PENDING'])
+    app.extensions['feedback_buffer'] = buffer
+    atexit.register(buffer.flush)
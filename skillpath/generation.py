@@ -0,0 +1,100 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .extensions import db
+from .llm import call_openai_api, validate_ai_json_schema
+from .models import SkillPath, PathStep, Resource, StepResource, Progress, canonicalize_url
+from .similarity import index_skill_path
+
+# LLM calls run on this pool so a request can stop waiting at its deadline while the call finishes
+generation_pool = None
+generation_pool_lock = threading.Lock()
+
+def run_in_app_context(app, func, *args):
+    with app.app_context():
+        return func(*args)
+
+def start_llm_generation(app, prompt):
+    """Submit an OpenAI call and return its future; the caller decides how long to wait"""
+    global generation_pool
+    with generation_pool_lock:
+        if generation_pool is None:
+            generation_pool = ThreadPoolExecutor(max_workers=app.config['GENERATION_WORKERS'],
+                                                 thread_name_prefix='llm-generation')
+    return generation_pool.submit(run_in_app_context, app, call_openai_api, prompt)
+
+def create_path_steps(skill_path, ai_response):
+    """Create the steps, progress rows and resources described by a generated path"""
+    for step_data in ai_response['steps']:
+        step = PathStep(
+            skill_path_id=skill_path.id,
+            step_number=step_data['step_number'],
+            title=step_data['title'],
+            description=step_data['description'],
+            duration_weeks=step_data.get('duration_weeks', 1),
+            milestone=step_data.get('milestone', False)
+        )
+        
+        db.session.add(step)
+        db.session.flush()
+        
+        # Create progress entry for this step
+        progress = Progress(step_id=step.id)
+        db.session.add(progress)
+        
+        # Create resources for this step
+        for resource_data in step_data.get('resources', []):
+            # Check if resource already exists, under the canonical spelling it is stored with
+            url = canonicalize_url(resource_data.get('url')) or resource_data.get('url')
+            resource = Resource.query.filter_by(url=url).first()
+            if not resource and url:
+                resource = Resource(
+                    title=resource_data['title'],
+                    url=url,
+                    type=resource_data.get('type', 'article'),
+                    description=resource_data.get('description', ''),
+                    category=skill_path.career_goal
+                )
+                db.session.add(resource)
+                db.session.flush()
+            
+            if resource:
+                step_resource = StepResource(step_id=step.id, resource_id=resource.id)
+                db.session.add(step_resource)
+
+def upgrade_skill_path(skill_path_id, ai_response):
+    """Replace a locally generated path with the late LLM result, unless the user has started it"""
+    is_valid, validation_msg = validate_ai_json_schema(ai_response)
+    if not is_valid:
+        logging.info(f"Discarding late AI result for path {skill_path_id}: {validation_msg}")
+        return False
+    
+    skill_path = db.session.get(SkillPath, skill_path_id)
+    if skill_path is None:
+        return False
+    if any(step.progress and step.progress.status != 'todo' for step in skill_path.steps):
+        logging.info(f"Keeping local path {skill_path_id}: progress already recorded")
+        return False
+    
+    # delete-orphan cascades remove the old steps with their progress and resource links
+    skill_path.steps.clear()
+    db.session.flush()
+    
+    skill_path.title = ai_response['title']
+    skill_path.description = ai_response['description']
+    skill_path.generated_content = ai_response
+    create_path_steps(skill_path, ai_response)
+    index_skill_path(skill_path)
+    db.session.commit()
+    logging.info(f"Upgraded path {skill_path_id} with the AI result")
+    return True
+
+def upgrade_when_ready(app, skill_path_id, future):
+    """Done-callback for a generation that missed its deadline"""
+    ai_response = future.result()
+    if ai_response:
+        try:
+            run_in_app_context(app, upgrade_skill_path, skill_path_id, ai_response)
+        except Exception as e:
+            logging.error(f"Upgrading path {skill_path_id} failed: {str(e)}")
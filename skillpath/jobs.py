@@ -0,0 +1,45 @@
+import time
+import logging
+
+from .extensions import db
+from .models import Resource, StepResource, BulkJob
+
+def run_bulk_delete_resources(app, job_id):
+    """Delete a job's resources and their step links in short, separately committed batches"""
+    with app.app_context():
+        job = db.session.get(BulkJob, job_id)
+        resource_ids = job.payload['resource_ids']
+        batch_size = app.config['BULK_DELETE_BATCH_SIZE']
+        pause = app.config['BULK_DELETE_PAUSE_SECONDS']
+        
+        job.status = 'running'
+        db.session.commit()
+        
+        try:
+            for start in range(0, len(resource_ids), batch_size):
+                chunk = resource_ids[start:start + batch_size]
+                
+                # Step links first, a bounded number per transaction
+                while True:
+                    link_ids = [row[0] for row in db.session.query(StepResource.id).filter(
+                        StepResource.resource_id.in_(chunk)
+                    ).limit(batch_size)]
+                    if not link_ids:
+                        break
+                    StepResource.query.filter(StepResource.id.in_(link_ids)).delete(synchronize_session=False)
+                    db.session.commit()
+                    time.sleep(pause)
+                
+                Resource.query.filter(Resource.id.in_(chunk)).delete(synchronize_session=False)
+                job.processed = start + len(chunk)
+                db.session.commit()
+                time.sleep(pause)
+            
+            job.status = 'done'
+        except Exception as e:
+            db.session.rollback()
+            logging.error(f"Bulk delete job {job_id} failed: {str(e)}")
+            job.status = 'failed'
+            job.error = str(e)
+        
+        db.session.commit()
@@ -0,0 +1,168 @@
+import json
+import logging
+
+from flask import current_app
+
+def generate_skill_path_prompt(career_goal, current_level, interests, weekly_hours, timeline_weeks):
+    """Generate the prompt for OpenAI to create a learning path"""
+    
+    prompt = f"""
+    Create a detailed, personalized learning roadmap for someone who wants to become a {career_goal}.
+    
+    USER PROFILE:
+    - Current Skill Level: {current_level}
+    - Interests: {interests}
+    - Weekly Study Hours: {weekly_hours}
+    - Timeline: {timeline_weeks} weeks
+    
+    REQUIREMENTS:
+    Generate a structured learning path with 6-12 steps that progressively build skills.
+    Include milestones to mark significant achievements.
+    For each step, suggest 2-3 learning resources (courses, books, tutorials, projects).
+    
+    OUTPUT FORMAT (JSON):
+    {{
+        "title": "Comprehensive Learning Path for [Career Goal]",
+        "description": "Detailed description of the learning journey",
+        "steps": [
+            {{
+                "step_number": 1,
+                "title": "Step title",
+                "description": "Detailed learning objectives and outcomes",
+                "duration_weeks": 2,
+                "milestone": false,
+                "resources": [
+                    {{
+                        "title": "Resource title",
+                        "url": "https://example.com",
+                        "type": "course/video/article/book",
+                        "description": "Why this resource is valuable"
+                    }}
+                ]
+            }}
+        ],
+        "milestones": [
+            "List of major achievements throughout the path"
+        ]
+    }}
+    
+    Make the path realistic for the given timeline and weekly hours. Focus on practical, hands-on learning.
+    """
+    
+    return prompt
+
+def validate_ai_json_schema(data):
+    """Validate the AI-generated JSON against our expected schema"""
+    try:
+        if not isinstance(data, dict):
+            return False, "Root must be an object"
+        
+        required_fields = ['title', 'description', 'steps']
+        for field in required_fields:
+            if field not in data:
+                return False, f"Missing required field: {field}"
+        
+        if not isinstance(data['steps'], list):
+            return False, "Steps must be an array"
+        
+        for step in data['steps']:
+            if not all(key in step for key in ['step_number', 'title', 'description', 'duration_weeks']):
+                return False, "Step missing required fields"
+            
+            if 'resources' in step and not isinstance(step['resources'], list):
+                return False, "Step resources must be an array"
+        
+        return True, "Valid schema"
+    
+    except Exception as e:
+        return False, f"Validation error: {str(e)}"
+
+SYSTEM_PROMPT = "You are an expert career coach and learning path designer. Create structured, practical learning roadmaps. Always respond with valid JSON format."
+
+def build_chat_request(prompt):
+    """Build the ChatCompletion arguments for one learning path request"""
+    return {
+        'model': "gpt-3.5-turbo",  # More available than gpt-4
+        'messages': [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        'temperature': 0.7,
+        'max_tokens': 2000  # Reduced for cost and reliability
+    }
+
+def estimate_request_tokens(prompt):
+    """Rough token cost of one call: ~4 characters per prompt token plus the completion budget"""
+    chat_request = build_chat_request(prompt)
+    prompt_chars = sum(len(message['content']) for message in chat_request['messages'])
+    return prompt_chars // 4 + chat_request['max_tokens']
+
+def parse_ai_response(response):
+    """Extract and decode the JSON payload from a ChatCompletion response"""
+    content = response.choices[0].message.content.strip()
+    
+    # More robust JSON extraction
+    if '```json' in content:
+        content = content[content.find('```json') + 7:content.rfind('```')]
+    elif '```' in content:
+        content = content[content.find('```') + 3:content.rfind('```')]
+    
+    # Clean the content
+    content = content.strip()
+    
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        logging.error(f"JSON decode error: {str(e)}")
+        logging.error(f"Response content: {content}")
+        return None
+
+def get_openai():
+    """Import the OpenAI client on first use, so workers that never generate skip loading it"""
+    import openai
+    if openai.api_key is None:
+        openai.api_key = current_app.config['OPENAI_API_KEY']
+    return openai
+
+def report_openai_error(openai, e):
+    """Log a failed call; a rate limit also pauses new admissions for a while"""
+    if isinstance(e, openai.error.AuthenticationError):
+        logging.error(f"OpenAI Authentication Error: {str(e)}")
+    elif isinstance(e, openai.error.RateLimitError):
+        logging.error(f"OpenAI Rate Limit Error: {str(e)}")
+        current_app.extensions['generation_scheduler'].pause(20)
+    elif isinstance(e, openai.error.APIError):
+        logging.error(f"OpenAI API Error: {str(e)}")
+    else:
+        logging.error(f"Unexpected error in call_openai_api: {str(e)}")
+
+def call_openai_api(prompt):
+    """Call OpenAI API to generate the learning path with better error handling"""
+    openai = get_openai()
+    try:
+        # Check if API key is available
+        if not openai.api_key:
+            logging.error("OpenAI API key is not set")
+            return None
+        
+        response = openai.ChatCompletion.create(**build_chat_request(prompt))
+        return parse_ai_response(response)
+    
+    except Exception as e:
+        report_openai_error(openai, e)
+        return None
+
+async def acall_openai_api(prompt):
+    """call_openai_api as a coroutine, for the async serving mode; needs an app context"""
+    openai = get_openai()
+    try:
+        if not openai.api_key:
+            logging.error("OpenAI API key is not set")
+            return None
+        
+        response = await openai.ChatCompletion.acreate(**build_chat_request(prompt))
+        return parse_ai_response(response)
+    
+    except Exception as e:
+        report_openai_error(openai, e)
+        return None
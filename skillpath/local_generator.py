@@ -0,0 +1,451 @@
+import re
+import time
+import threading
+
+from sqlalchemy import or_
+
+from .models import Resource
+
+# Step blueprints per career domain. `hours` is the typical effort and sets each step's share of the
+# timeline; `level: 'beginner'` steps are skipped for intermediate/advanced learners and `optional`
+# steps are dropped first when the timeline or weekly hours are too short for the whole path.
+DOMAIN_BLUEPRINTS = [
+    {
+        'key': 'data_science',
+        'keywords': ['data scien', 'data analy', 'analyst', 'analytics', 'statistic', 'pandas',
+                     'visualization', 'business intelligence', 'tableau', 'power bi', 'excel'],
+        'steps': [
+            {'title': 'Python for Data Work', 'level': 'beginner', 'hours': 30,
+             'description': 'Learn Python syntax, data structures and functions, working in Jupyter notebooks.',
+             'keywords': ['python', 'jupyter'],
+             'resource': ('The Python Tutorial', 'https://docs.python.org/3/tutorial/', 'documentation')},
+            {'title': 'Statistics and Probability', 'hours': 35,
+             'description': 'Descriptive statistics, distributions, sampling, hypothesis tests and confidence intervals.',
+             'keywords': ['statistic', 'probability'],
+             'resource': ('Khan Academy Statistics and Probability', 'https://www.khanacademy.org/math/statistics-probability', 'course')},
+            {'title': 'Data Wrangling with pandas and SQL', 'hours': 40, 'milestone': True,
+             'description': 'Load, clean, join and aggregate real datasets with pandas and SQL queries.',
+             'keywords': ['pandas', 'sql', 'data cleaning'],
+             'resource': ('pandas Getting Started', 'https://pandas.pydata.org/docs/getting_started/index.html', 'documentation')},
+            {'title': 'Exploratory Analysis and Visualization', 'hours': 30,
+             'description': 'Explore data and communicate findings with matplotlib, seaborn and dashboards.',
+             'keywords': ['visualization', 'matplotlib', 'seaborn', 'tableau', 'dashboard'],
+             'resource': ('Kaggle Data Visualization', 'https://www.kaggle.com/learn/data-visualization', 'course')},
+            {'title': 'Machine Learning Fundamentals', 'hours': 45, 'milestone': True,
+             'description': 'Regression, classification, model evaluation and feature engineering with scikit-learn.',
+             'keywords': ['machine learning', 'scikit', 'regression', 'classification'],
+             'resource': ('scikit-learn Tutorials', 'https://scikit-learn.org/stable/tutorial/index.html', 'tutorial')},
+            {'title': 'Advanced Topics', 'hours': 30, 'optional': True,
+             'description': 'Go deeper into {interests} with focused reading and exercises.',
+             'keywords': ['time series', 'deep learning', 'nlp', 'experiment'],
+             'resource': ('Kaggle Learn', 'https://www.kaggle.com/learn', 'course')},
+        ]
+    },
+    {
+        'key': 'machine_learning',
+        'keywords': ['machine learning', 'ml', 'ai', 'artificial intelligence', 'deep learning', 'neural',
+                     'nlp', 'natural language', 'computer vision', 'llm', 'pytorch', 'tensorflow'],
+        'steps': [
+            {'title': 'Python and Math Foundations', 'level': 'beginner', 'hours': 40,
+             'description': 'Python, NumPy, linear algebra, calculus and probability needed for machine learning.',
+             'keywords': ['python', 'numpy', 'linear algebra', 'math'],
+             'resource': ('Mathematics for Machine Learning', 'https://mml-book.github.io/', 'book')},
+            {'title': 'Classical Machine Learning', 'hours': 45, 'milestone': True,
+             'description': 'Supervised and unsupervised learning, validation, regularization and pipelines with scikit-learn.',
+             'keywords': ['machine learning', 'scikit', 'regression', 'classification'],
+             'resource': ('scikit-learn Tutorials', 'https://scikit-learn.org/stable/tutorial/index.html', 'tutorial')},
+            {'title': 'Deep Learning with PyTorch', 'hours': 50,
+             'description': 'Neural networks, backpropagation, CNNs and training loops in PyTorch.',
+             'keywords': ['deep learning', 'pytorch', 'neural', 'tensorflow'],
+             'resource': ('Practical Deep Learning for Coders', 'https://course.fast.ai/', 'course')},
+            {'title': 'Specialization Project', 'hours': 45, 'milestone': True,
+             'description': 'Apply modern architectures to {interests}, reproducing a published result end to end.',
+             'keywords': ['nlp', 'transformer', 'vision', 'llm', 'reinforcement'],
+             'resource': ('PyTorch Tutorials', 'https://pytorch.org/tutorials/', 'tutorial')},
+            {'title': 'Deploying and Monitoring Models', 'hours': 30, 'optional': True,
+             'description': 'Package models behind an API, track experiments and monitor them in production.',
+             'keywords': ['mlops', 'deployment', 'docker', 'monitoring'],
+             'resource': ('Made With ML', 'https://madewithml.com/', 'course')},
+        ]
+    },
+    {
+        'key': 'web_development',
+        'keywords': ['web', 'frontend', 'front-end', 'front end', 'backend', 'back-end', 'back end',
+                     'full stack', 'fullstack', 'full-stack', 'javascript', 'typescript', 'react', 'html',
+                     'css', 'node', 'django', 'flask'],
+        'steps': [
+            {'title': 'HTML, CSS and the Web Platform', 'level': 'beginner', 'hours': 30,
+             'description': 'Semantic HTML, modern CSS layout, responsive design and how browsers load pages.',
+             'keywords': ['html', 'css', 'responsive'],
+             'resource': ('MDN Learn Web Development', 'https://developer.mozilla.org/en-US/docs/Learn', 'documentation')},
+            {'title': 'JavaScript Fundamentals', 'level': 'beginner', 'hours': 40,
+             'description': 'Language fundamentals, the DOM, events, promises and async/await.',
+             'keywords': ['javascript', 'dom', 'async'],
+             'resource': ('The Modern JavaScript Tutorial', 'https://javascript.info/', 'tutorial')},
+            {'title': 'Version Control and Tooling', 'hours': 15,
+             'description': 'Git workflows, package managers, bundlers and linting.',
+             'keywords': ['git', 'npm', 'tooling'],
+             'resource': ('Pro Git', 'https://git-scm.com/book/en/v2', 'book')},
+            {'title': 'Frontend Framework', 'hours': 40, 'milestone': True,
+             'description': 'Components, state, routing and data fetching with React.',
+             'keywords': ['react', 'vue', 'angular', 'frontend'],
+             'resource': ('React: Learn', 'https://react.dev/learn', 'documentation')},
+            {'title': 'Backend APIs and Databases', 'hours': 45,
+             'description': 'Build a REST API with authentication and a relational database behind it.',
+             'keywords': ['node', 'django', 'flask', 'api', 'sql', 'backend'],
+             'resource': ('SQLBolt', 'https://sqlbolt.com/', 'tutorial')},
+            {'title': 'Testing, Performance and Deployment', 'hours': 25, 'optional': True,
+             'description': 'Automated tests, web performance budgets and deploying to a cloud host.',
+             'keywords': ['testing', 'performance', 'deploy'],
+             'resource': ('web.dev Learn', 'https://web.dev/learn', 'course')},
+        ]
+    },
+    {
+        'key': 'mobile_development',
+        'keywords': ['mobile', 'android', 'ios', 'swift', 'kotlin', 'flutter', 'react native', 'app developer'],
+        'steps': [
+            {'title': 'Programming Fundamentals for Mobile', 'level': 'beginner', 'hours': 35,
+             'description': 'Learn Kotlin or Swift fundamentals: types, control flow, classes and closures.',
+             'keywords': ['kotlin', 'swift', 'dart'],
+             'resource': ('Kotlin Docs: Getting Started', 'https://kotlinlang.org/docs/getting-started.html', 'documentation')},
+            {'title': 'UI Building Blocks', 'hours': 40, 'milestone': True,
+             'description': 'Declarative UI, layouts, navigation and state with Jetpack Compose or SwiftUI.',
+             'keywords': ['compose', 'swiftui', 'flutter', 'ui'],
+             'resource': ('SwiftUI Tutorials', 'https://developer.apple.com/tutorials/swiftui', 'tutorial')},
+            {'title': 'Data, Networking and Persistence', 'hours': 35,
+             'description': 'Call REST APIs, cache data locally and handle offline use.',
+             'keywords': ['networking', 'api', 'sqlite', 'room'],
+             'resource': ('Android Basics with Compose', 'https://developer.android.com/courses', 'course')},
+            {'title': 'Cross-platform with Flutter', 'hours': 30, 'optional': True,
+             'description': 'Build the same app for Android and iOS from one Dart codebase.',
+             'keywords': ['flutter', 'react native', 'cross-platform'],
+             'resource': ('Flutter Codelab', 'https://docs.flutter.dev/get-started/codelab', 'tutorial')},
+            {'title': 'Testing and Store Release', 'hours': 20,
+             'description': 'Unit and UI tests, signing, and publishing to Google Play or the App Store.',
+             'keywords': ['testing', 'release', 'play store', 'app store'],
+             'resource': ('Android: Publish your app', 'https://developer.android.com/studio/publish', 'documentation')},
+        ]
+    },
+    {
+        'key': 'devops_cloud',
+        'keywords': ['devops', 'cloud', 'aws', 'azure', 'gcp', 'kubernetes', 'docker', 'sre',
+                     'site reliability', 'infrastructure', 'terraform', 'platform engineer'],
+        'steps': [
+            {'title': 'Linux and Networking Basics', 'level': 'beginner', 'hours': 30,
+             'description': 'The shell, processes, permissions, DNS, HTTP and TCP/IP fundamentals.',
+             'keywords': ['linux', 'bash', 'networking'],
+             'resource': ('Linux Journey', 'https://linuxjourney.com/', 'tutorial')},
+            {'title': 'Scripting and Version Control', 'level': 'beginner', 'hours': 20,
+             'description': 'Automate tasks with Bash and Python and collaborate with Git.',
+             'keywords': ['bash', 'python', 'git'],
+             'resource': ('Pro Git', 'https://git-scm.com/book/en/v2', 'book')},
+            {'title': 'Containers with Docker', 'hours': 30, 'milestone': True,
+             'description': 'Images, Dockerfiles, volumes, networks and Compose.',
+             'keywords': ['docker', 'container'],
+             'resource': ('Docker Get Started', 'https://docs.docker.com/get-started/', 'documentation')},
+            {'title': 'CI/CD Pipelines', 'hours': 25,
+             'description': 'Build, test and deploy automatically with GitHub Actions or GitLab CI.',
+             'keywords': ['ci/cd', 'github actions', 'jenkins', 'pipeline'],
+             'resource': ('GitHub Actions Docs', 'https://docs.github.com/en/actions', 'documentation')},
+            {'title': 'Cloud Platforms and Infrastructure as Code', 'hours': 40, 'milestone': True,
+             'description': 'Core AWS/Azure/GCP services provisioned with Terraform.',
+             'keywords': ['aws', 'azure', 'gcp', 'terraform', 'cloud'],
+             'resource': ('Terraform Tutorials', 'https://developer.hashicorp.com/terraform/tutorials', 'tutorial')},
+            {'title': 'Kubernetes and Observability', 'hours': 40, 'optional': True,
+             'description': 'Deploy and scale services on Kubernetes with metrics, logs and alerts.',
+             'keywords': ['kubernetes', 'prometheus', 'monitoring', 'observability'],
+             'resource': ('Kubernetes Basics', 'https://kubernetes.io/docs/tutorials/kubernetes-basics/', 'tutorial')},
+        ]
+    },
+    {
+        'key': 'cybersecurity',
+        'keywords': ['security', 'cyber', 'penetration', 'pentest', 'ethical hack', 'soc', 'infosec',
+                     'forensic', 'malware', 'red team', 'blue team'],
+        'steps': [
+            {'title': 'Networking and Operating Systems', 'level': 'beginner', 'hours': 35,
+             'description': 'TCP/IP, common protocols, Linux and Windows internals from a defender\'s view.',
+             'keywords': ['networking', 'linux', 'windows'],
+             'resource': ('Cloudflare Learning Center', 'https://www.cloudflare.com/learning/', 'article')},
+            {'title': 'Security Fundamentals', 'hours': 30, 'milestone': True,
+             'description': 'The CIA triad, threat modelling, cryptography basics and access control.',
+             'keywords': ['cryptography', 'security', 'threat'],
+             'resource': ('OWASP Top Ten', 'https://owasp.org/www-project-top-ten/', 'documentation')},
+            {'title': 'Hands-on Labs', 'hours': 40,
+             'description': 'Practice attacks and defences in guided lab environments.',
+             'keywords': ['lab', 'ctf', 'hack'],
+             'resource': ('TryHackMe', 'https://tryhackme.com/', 'course')},
+            {'title': 'Focus Area', 'hours': 40, 'milestone': True,
+             'description': 'Specialize in {interests}: tooling, methodology and write-ups.',
+             'keywords': ['penetration', 'forensic', 'soc', 'incident', 'malware'],
+             'resource': ('PortSwigger Web Security Academy', 'https://portswigger.net/web-security', 'course')},
+            {'title': 'Certification Preparation', 'hours': 30, 'optional': True,
+             'description': 'Prepare for an entry certification such as Security+ or an equivalent.',
+             'keywords': ['certification', 'security+', 'oscp'],
+             'resource': ('Professor Messer Security+', 'https://www.professormesser.com/', 'video')},
+        ]
+    },
+    {
+        'key': 'data_engineering',
+        'keywords': ['data engineer', 'etl', 'elt', 'pipeline', 'spark', 'airflow', 'warehouse',
+                     'big data', 'sql', 'dbt', 'kafka'],
+        'steps': [
+            {'title': 'SQL and Data Modelling', 'level': 'beginner', 'hours': 35,
+             'description': 'Advanced SQL, normalization and dimensional modelling.',
+             'keywords': ['sql', 'modelling', 'database'],
+             'resource': ('SQLBolt', 'https://sqlbolt.com/', 'tutorial')},
+            {'title': 'Python for Data Pipelines', 'level': 'beginner', 'hours': 25,
+             'description': 'Python for ingestion scripts, file formats and API extraction.',
+             'keywords': ['python', 'etl'],
+             'resource': ('The Python Tutorial', 'https://docs.python.org/3/tutorial/', 'documentation')},
+            {'title': 'Warehouses and Transformations', 'hours': 35, 'milestone': True,
+             'description': 'Load data into a cloud warehouse and transform it with dbt.',
+             'keywords': ['warehouse', 'dbt', 'snowflake', 'bigquery'],
+             'resource': ('dbt: Get started', 'https://docs.getdbt.com/docs/get-started-dbt', 'documentation')},
+            {'title': 'Orchestration', 'hours': 25,
+             'description': 'Schedule and monitor pipelines as DAGs with Airflow.',
+             'keywords': ['airflow', 'orchestration', 'dag'],
+             'resource': ('Airflow Tutorial', 'https://airflow.apache.org/docs/apache-airflow/stable/tutorial/index.html', 'tutorial')},
+            {'title': 'Distributed Processing and Streaming', 'hours': 40, 'optional': True,
+             'description': 'Batch processing with Spark and event streams with Kafka.',
+             'keywords': ['spark', 'kafka', 'streaming'],
+             'resource': ('Spark Quick Start', 'https://spark.apache.org/docs/latest/quick-start.html', 'documentation')},
+        ]
+    },
+    {
+        'key': 'ux_design',
+        'keywords': ['ux', 'ui', 'design', 'user experience', 'user interface', 'figma', 'product design',
+                     'interaction', 'user research'],
+        'steps': [
+            {'title': 'Design Principles', 'level': 'beginner', 'hours': 25,
+             'description': 'Visual hierarchy, typography, color, layout and accessibility basics.',
+             'keywords': ['design', 'typography', 'accessibility'],
+             'resource': ('Nielsen Norman Group Articles', 'https://www.nngroup.com/articles/', 'article')},
+            {'title': 'User Research', 'hours': 30, 'milestone': True,
+             'description': 'Interviews, personas, journey maps and usability testing.',
+             'keywords': ['research', 'usability', 'persona'],
+             'resource': ('Google UX Design Certificate', 'https://www.coursera.org/professional-certificates/google-ux-design', 'course')},
+            {'title': 'Wireframing and Prototyping in Figma', 'hours': 35,
+             'description': 'From sketches to interactive prototypes using components and auto layout.',
+             'keywords': ['figma', 'prototype', 'wireframe'],
+             'resource': ('Figma Help Center', 'https://help.figma.com/', 'documentation')},
+            {'title': 'Design Systems and Handoff', 'hours': 25, 'optional': True,
+             'description': 'Tokens, component libraries and working with engineers.',
+             'keywords': ['design system', 'components', 'handoff'],
+             'resource': ('Material Design', 'https://m3.material.io/', 'documentation')},
+        ]
+    },
+    {
+        'key': 'product_management',
+        'keywords': ['product manag', 'product owner', 'roadmap', 'agile', 'scrum', 'stakeholder'],
+        'steps': [
+            {'title': 'Product Thinking', 'level': 'beginner', 'hours': 20,
+             'description': 'Problem discovery, user needs, value propositions and product strategy.',
+             'keywords': ['product', 'strategy', 'discovery'],
+             'resource': ('SVPG Articles', 'https://www.svpg.com/articles/', 'article')},
+            {'title': 'Agile Delivery', 'hours': 20,
+             'description': 'Scrum and Kanban, writing user stories and running planning and retros.',
+             'keywords': ['agile', 'scrum', 'kanban'],
+             'resource': ('The Scrum Guide', 'https://scrumguides.org/', 'documentation')},
+            {'title': 'Metrics and Experimentation', 'hours': 30, 'milestone': True,
+             'description': 'North-star metrics, funnels, A/B tests and making data-informed calls.',
+             'keywords': ['metrics', 'analytics', 'a/b', 'experiment'],
+             'resource': ('Amplitude Product Analytics Playbook', 'https://amplitude.com/books', 'book')},
+            {'title': 'Roadmaps and Stakeholders', 'hours': 20,
+             'description': 'Prioritization frameworks, roadmaps and communicating trade-offs.',
+             'keywords': ['roadmap', 'prioritization', 'stakeholder'],
+             'resource': ('Atlassian Product Management Guide', 'https://www.atlassian.com/agile/product-management', 'article')},
+        ]
+    },
+    {
+        'key': 'digital_marketing',
+        'keywords': ['marketing', 'seo', 'content', 'social media', 'growth', 'ads', 'copywriting',
+                     'brand', 'email marketing'],
+        'steps': [
+            {'title': 'Marketing Fundamentals', 'level': 'beginner', 'hours': 20,
+             'description': 'Audiences, positioning, funnels and channel strategy.',
+             'keywords': ['marketing', 'funnel', 'positioning'],
+             'resource': ('HubSpot Academy', 'https://academy.hubspot.com/', 'course')},
+            {'title': 'Search Engine Optimization', 'hours': 25, 'milestone': True,
+             'description': 'Keyword research, on-page SEO, technical SEO and link building.',
+             'keywords': ['seo', 'search'],
+             'resource': ('Google Search Central SEO Starter Guide', 'https://developers.google.com/search/docs/fundamentals/seo-starter-guide', 'documentation')},
+            {'title': 'Content and Social Media', 'hours': 25,
+             'description': 'Plan, write and distribute content; grow and measure social channels.',
+             'keywords': ['content', 'social media', 'copywriting'],
+             'resource': ('Copyblogger', 'https://copyblogger.com/', 'article')},
+            {'title': 'Paid Acquisition and Analytics', 'hours': 30,
+             'description': 'Search and social ads, attribution and Google Analytics reporting.',
+             'keywords': ['ads', 'analytics', 'ppc'],
+             'resource': ('Google Skillshop', 'https://skillshop.withgoogle.com/', 'course')},
+        ]
+    },
+]
+
+# Used when no domain matches the goal or interests
+GENERAL_STEPS = [
+    {'title': 'Foundations of {goal}', 'level': 'beginner', 'hours': 30,
+     'description': 'Map out the field of {goal}, its core vocabulary and the fundamental concepts.',
+     'keywords': ['introduction', 'fundamentals', 'basics'],
+     'resource': ('roadmap.sh', 'https://roadmap.sh/', 'article')},
+    {'title': 'Core Skills Development', 'hours': 40, 'milestone': True,
+     'description': 'Build the essential {goal} skills through structured study and regular practice.',
+     'keywords': ['course', 'skills'],
+     'resource': ('Coursera', 'https://www.coursera.org/', 'course')},
+    {'title': 'Deep Dive', 'hours': 35,
+     'description': 'Focus on {interests}, reading widely and practicing on small exercises.',
+     'keywords': ['advanced', 'guide'],
+     'resource': ('edX', 'https://www.edx.org/', 'course')},
+]
+
+# Closing steps shared by every path
+CAREER_STEPS = [
+    {'title': 'Portfolio Project', 'hours': 40, 'milestone': True,
+     'description': 'Build and publish a substantial {goal} project around {interests}, documented end to end.',
+     'keywords': ['project', 'portfolio'],
+     'resource': ('GitHub Docs: Hello World', 'https://docs.github.com/en/get-started/start-your-journey/hello-world', 'documentation')},
+    {'title': 'Job Readiness', 'hours': 15, 'optional': True,
+     'description': 'Polish your resume and portfolio, network, and practice {goal} interviews.',
+     'keywords': ['interview', 'career', 'resume'],
+     'resource': ('Tech Interview Handbook', 'https://www.techinterviewhandbook.org/', 'article')},
+]
+
+# Titles are String(200) columns: interests only go into descriptions, and long goals are shortened
+TITLE_GOAL_LENGTH = 80
+
+# Catalogue resources are re-read at most this often per domain
+CATALOGUE_CACHE_SECONDS = 300
+RESOURCES_PER_STEP = 2
+
+catalogue_cache = {}
+catalogue_cache_lock = threading.Lock()
+
+def keyword_pattern(keyword):
+    # Short keywords (ai, ml, ux) must be whole words; longer ones may be word prefixes (analy, scien)
+    return r'\b' + re.escape(keyword) + (r'\b' if len(keyword) <= 3 else '')
+
+def keyword_score(keywords, text):
+    """Number of keywords found in text"""
+    return sum(1 for keyword in keywords if re.search(keyword_pattern(keyword), text))
+
+def rank_domains(career_goal, interests):
+    """Domains ordered by keyword matches, the career goal counting three times as much as interests"""
+    goal, extra = (career_goal or '').lower(), (interests or '').lower()
+    scored = []
+    for position, domain in enumerate(DOMAIN_BLUEPRINTS):
+        score = 3 * keyword_score(domain['keywords'], goal) + keyword_score(domain['keywords'], extra)
+        if score:
+            scored.append((-score, position, domain))
+    return [domain for _, _, domain in sorted(scored, key=lambda item: item[:2])]
+
+def catalogue_candidates(domain):
+    """Catalogue resources related to a domain, cached briefly so generation stays in-memory"""
+    key = domain['key'] if domain else 'general'
+    now = time.monotonic()
+    with catalogue_cache_lock:
+        cached = catalogue_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+    
+    keywords = domain['keywords'] if domain else ['career', 'fundamentals']
+    conditions = [column.ilike(f'%{keyword}%') for keyword in keywords for column in (Resource.category, Resource.title)]
+    rows = [
+        {'title': r.title, 'url': r.url, 'type': r.type or 'article', 'description': r.description or '',
+         'text': f'{r.title} {r.category or ""} {r.description or ""}'.lower()}
+        for r in Resource.query.filter(Resource.url.isnot(None), Resource.url != '', or_(*conditions))
+        .order_by(Resource.title, Resource.id).limit(500)
+    ]
+    with catalogue_cache_lock:
+        catalogue_cache[key] = (now + CATALOGUE_CACHE_SECONDS, rows)
+    return rows
+
+def pick_resources(step, candidates, used_urls):
+    """Up to RESOURCES_PER_STEP catalogue matches for a step, else its built-in resource"""
+    picked = []
+    for candidate in candidates:
+        if candidate['url'] not in used_urls and keyword_score(step['keywords'], candidate['text']):
+            picked.append({key: candidate[key] for key in ('title', 'url', 'type', 'description')})
+            used_urls.add(candidate['url'])
+            if len(picked) == RESOURCES_PER_STEP:
+                break
+    
+    if not picked:
+        title, url, resource_type = step['resource']
+        picked.append({'title': title, 'url': url, 'type': resource_type, 'description': f'Recommended for: {step["title"]}'})
+    return picked
+
+def allocate_weeks(hours, timeline_weeks):
+    """Split the timeline across steps in proportion to effort, at least one week each (largest remainder)"""
+    total_weeks = max(timeline_weeks, len(hours))
+    spare = total_weeks - len(hours)
+    shares = [spare * h / sum(hours) for h in hours]
+    weeks = [1 + int(share) for share in shares]
+    by_remainder = sorted(range(len(hours)), key=lambda i: (int(shares[i]) - shares[i], i))
+    for i in by_remainder[:total_weeks - sum(weeks)]:
+        weeks[i] += 1
+    return weeks
+
+def select_steps(domains, current_level, interests, weekly_hours, timeline_weeks):
+    """Blueprint steps for the best domain, plus an elective from the runner-up, fitted to the time available"""
+    steps = list(domains[0]['steps']) if domains else list(GENERAL_STEPS)
+    if (current_level or '').lower() != 'beginner':
+        steps = [step for step in steps if step.get('level') != 'beginner']
+    
+    # A second matching domain contributes the step closest to the learner's interests
+    if len(domains) > 1:
+        extra = (interests or '').lower()
+        electives = [step for step in domains[1]['steps']
+                     if step.get('level') != 'beginner' and keyword_score(step['keywords'], extra)]
+        if electives:
+            steps.append(dict(electives[0], optional=True))
+    
+    steps += CAREER_STEPS
+    
+    # Drop optional steps, last first, while the path needs more hours or weeks than are available
+    available_hours = weekly_hours * timeline_weeks
+    for step in reversed(list(steps)):
+        if sum(s['hours'] for s in steps) <= available_hours and len(steps) <= timeline_weeks:
+            break
+        if step.get('optional'):
+            steps.remove(step)
+    return steps
+
+def shorten(text, limit):
+    """Collapse whitespace and cut at a word boundary to at most `limit` characters"""
+    text = ' '.join((text or '').split())
+    if len(text) <= limit:
+        return text
+    return text[:limit - 3].rsplit(' ', 1)[0] + '...'
+
+def path_description(step_count, career_goal, current_level, interests, weekly_hours, timeline_weeks):
+    """Path-level description written from the learner's own request"""
+    return (f'A {step_count}-step journey from {current_level} to professional level in {career_goal}. '
+            f'Focuses on {interests} with {weekly_hours} hours per week over {timeline_weeks} weeks.')
+
+def generate_local_learning_path(career_goal, current_level, interests, weekly_hours, timeline_weeks):
+    """Build a learning path from the blueprint library and resource catalogue, without calling the LLM"""
+    domains = rank_domains(career_goal, interests)
+    steps = select_steps(domains, current_level, interests, weekly_hours, timeline_weeks)
+    weeks = allocate_weeks([step['hours'] for step in steps], timeline_weeks)
+    candidates = catalogue_candidates(domains[0] if domains else None)
+    
+    title_goal = shorten(career_goal, TITLE_GOAL_LENGTH)
+    used_urls = set()
+    path_steps = []
+    for number, (step, duration) in enumerate(zip(steps, weeks), start=1):
+        path_steps.append({
+            'step_number': number,
+            'title': step['title'].format(goal=title_goal),
+            'description': step['description'].format(goal=career_goal, interests=interests)
+                           + f" Plan on about {step['hours']} hours.",
+            'duration_weeks': duration,
+            'milestone': step.get('milestone', False),
+            'resources': pick_resources(step, candidates, used_urls)
+        })
+    
+    return {
+        'title': f'Learning Path for {title_goal}',
+        'description': path_description(len(path_steps), career_goal, current_level, interests, weekly_hours,
+                                        timeline_weeks),
+        'steps': path_steps,
+        'milestones': [step['title'] for step in path_steps if step['milestone']]
+    }
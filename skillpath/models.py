@@ -0,0 +1,256 @@
+import json
+import uuid
+import zlib
+import hashlib
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import relationship, deferred, validates
+
+from .extensions import db
+
+# Database Models
+class User(db.Model):
+    __tablename__ = 'users'
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(200), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    is_admin = db.Column(db.Boolean, default=False)
+    
+    # Relationships
+    skill_paths = relationship('SkillPath', back_populates='user', cascade='all, delete-orphan')
+
+class SkillPath(db.Model):
+    __tablename__ = 'skill_paths'
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    career_goal = db.Column(db.String(200), nullable=False)
+    current_level = db.Column(db.String(50), nullable=False)
+    interests = db.Column(db.Text)
+    weekly_hours = db.Column(db.Integer, nullable=False)
+    timeline_weeks = db.Column(db.Integer, nullable=False)
+    content_hash = db.Column(db.String(64), db.ForeignKey('generated_contents.content_hash'))
+    # Uncompressed AI JSON from before compact storage; emptied by `flask compact-generated-content`.
+    # none_as_null: clearing it must store SQL NULL, not the JSON text 'null'
+    legacy_generated_content = deferred(db.Column('generated_content', db.JSON(none_as_null=True)))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    user = relationship('User', back_populates='skill_paths')
+    steps = relationship('PathStep', back_populates='skill_path', cascade='all, delete-orphan')
+    content = relationship('GeneratedContent')
+    signature = relationship('PathSignature', uselist=False, cascade='all, delete-orphan')
+    lsh_buckets = relationship('PathLshBucket', cascade='all, delete-orphan')
+    
+    @property
+    def generated_content(self):
+        """AI-generated JSON, loaded only when accessed"""
+        if self.content is not None:
+            return decompress_content(self.content.data)
+        if self.legacy_generated_content is not None:
+            return self.legacy_generated_content
+        return reconstruct_generated_content(self)
+    
+    @generated_content.setter
+    def generated_content(self, value):
+        self.content = get_or_create_generated_content(value) if value is not None else None
+
+class GeneratedContent(db.Model):
+    __tablename__ = 'generated_contents'
+    content_hash = db.Column(db.String(64), primary_key=True)  # sha256 of canonical JSON
+    data = deferred(db.Column(db.LargeBinary, nullable=False))  # zlib-compressed JSON
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class PathSignature(db.Model):
+    __tablename__ = 'path_signatures'
+    skill_path_id = db.Column(db.String(36), db.ForeignKey('skill_paths.id'), primary_key=True)
+    signature = db.Column(db.LargeBinary, nullable=False)  # packed MinHash values
+
+class PathLshBucket(db.Model):
+    __tablename__ = 'path_lsh_buckets'
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    bucket_key = db.Column(db.String(100), nullable=False, index=True)  # level:band:hash
+    skill_path_id = db.Column(db.String(36), db.ForeignKey('skill_paths.id'), nullable=False, index=True)
+
+class PathStep(db.Model):
+    __tablename__ = 'path_steps'
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    skill_path_id = db.Column(db.String(36), db.ForeignKey('skill_paths.id'), nullable=False)
+    step_number = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    duration_weeks = db.Column(db.Integer)
+    milestone = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    skill_path = relationship('SkillPath', back_populates='steps')
+    progress = relationship('Progress', back_populates='step', uselist=False, cascade='all, delete-orphan')
+    step_resources = relationship('StepResource', back_populates='step', cascade='all, delete-orphan')
+
+def canonicalize_url(url):
+    """Normalize a URL so trivially different spellings dedupe; None if it is not http(s)"""
+    parts = urlsplit((url or '').strip())
+    if parts.scheme.lower() not in ('http', 'https') or not parts.netloc:
+        return None
+    path = parts.path.rstrip('/') or ''
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+class Resource(db.Model):
+    __tablename__ = 'resources'
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    title = db.Column(db.String(200), nullable=False)
+    url = db.Column(db.String(500), index=True)
+    type = db.Column(db.String(50))  # video, article, course, book, etc.
+    description = db.Column(db.Text)
+    category = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    step_resources = relationship('StepResource', back_populates='resource', cascade='all, delete-orphan')
+    
+    @validates('url')
+    def store_canonical_url(self, key, url):
+        # Every write path stores the same spelling, so imports and generated paths dedupe against it
+        return canonicalize_url(url) or url
+
+class StepResource(db.Model):
+    __tablename__ = 'step_resources'
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    step_id = db.Column(db.String(36), db.ForeignKey('path_steps.id'), nullable=False)
+    resource_id = db.Column(db.String(36), db.ForeignKey('resources.id'), nullable=False)
+    
+    # Relationships
+    step = relationship('PathStep', back_populates='step_resources')
+    resource = relationship('Resource', back_populates='step_resources')
+
+class Progress(db.Model):
+    __tablename__ = 'progress'
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    step_id = db.Column(db.String(36), db.ForeignKey('path_steps.id'), nullable=False)
+    status = db.Column(db.String(20), default='todo')  # todo, in_progress, done
+    completed_at = db.Column(db.DateTime)
+    notes = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    step = relationship('PathStep', back_populates='progress')
+
+class BulkJob(db.Model):
+    __tablename__ = 'bulk_jobs'
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = db.Column(db.String(50), nullable=False)  # delete_resources
+    status = db.Column(db.String(20), default='pending')  # pending, running, done, failed
+    payload = deferred(db.Column(db.JSON))
+    total = db.Column(db.Integer, default=0)
+    processed = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class Feedback(db.Model):
+    __tablename__ = 'feedback'
+    # One rating per user and path; rating again replaces it
+    __table_args__ = (db.Index('ix_feedback_user_path', 'user_id', 'skill_path_id', unique=True),)
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    skill_path_id = db.Column(db.String(36), db.ForeignKey('skill_paths.id'))
+    rating = db.Column(db.Integer, nullable=False)  # 1-5
+    comment = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class RatingAggregate(db.Model):
+    """Running rating totals per path ('path' scope) and per normalized career goal ('goal' scope)"""
+    __tablename__ = 'rating_aggregates'
+    scope = db.Column(db.String(10), primary_key=True)
+    scope_key = db.Column(db.String(200), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    rating_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_5 = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @property
+    def histogram(self):
+        return [self.rating_1, self.rating_2, self.rating_3, self.rating_4, self.rating_5]
+    
+    @property
+    def average(self):
+        return round(self.total / self.count, 2) if self.count else None
+
+# Generated Content Storage
+def canonical_json(data):
+    """Serialize JSON deterministically so identical content hashes identically"""
+    return json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+def decompress_content(blob):
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+def get_or_create_generated_content(data):
+    """Return the stored row for this content, creating it if it is new"""
+    raw = canonical_json(data)
+    content_hash = hashlib.sha256(raw).hexdigest()
+    
+    content = db.session.get(GeneratedContent, content_hash)
+    if not content:
+        insert_generated_content(content_hash, zlib.compress(raw, 9))
+        content = db.session.get(GeneratedContent, content_hash)
+    
+    return content
+
+def insert_generated_content(content_hash, data):
+    """Insert a content row unless a concurrent request already stored the same content"""
+    row = {'content_hash': content_hash, 'data': data, 'created_at': datetime.utcnow()}
+    dialect = db.session.connection().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(GeneratedContent.__table__.insert(), row)
+        except IntegrityError:
+            pass
+        return
+    
+    db.session.execute(insert(GeneratedContent.__table__).values(row).on_conflict_do_nothing(
+        index_elements=['content_hash']
+    ))
+
+def reconstruct_generated_content(skill_path):
+    """Rebuild the AI JSON from the normalized steps and resources"""
+    steps = []
+    for step in sorted(skill_path.steps, key=lambda x: x.step_number):
+        steps.append({
+            'step_number': step.step_number,
+            'title': step.title,
+            'description': step.description,
+            'duration_weeks': step.duration_weeks,
+            'milestone': step.milestone,
+            'resources': [
+                {
+                    'title': sr.resource.title,
+                    'url': sr.resource.url,
+                    'type': sr.resource.type,
+                    'description': sr.resource.description
+                }
+                for sr in step.step_resources
+            ]
+        })
+    
+    return {
+        'title': skill_path.title,
+        'description': skill_path.description,
+        'steps': steps
+    }
@@ -0,0 +1,314 @@
+import time
+import logging
+from concurrent.futures import wait
+from datetime import datetime
+from functools import partial
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, current_app
+from sqlalchemy import func
+
+from .assets import asset_url
+from .auth import login_required
+from .conditional import conditional, latest
+from .extensions import db, read_only
+from .feedback import get_rating_summary
+from .generation import start_llm_generation, create_path_steps, upgrade_when_ready
+from .llm import generate_skill_path_prompt, validate_ai_json_schema, estimate_request_tokens
+from .local_generator import generate_local_learning_path
+from .models import SkillPath, PathStep, Resource, StepResource, Progress
+from .similarity import find_similar_path, index_skill_path, adapt_generated_content
+
+bp = Blueprint('paths', __name__)
+
+@bp.route('/')
+def index():
+    if 'user_id' in session:
+        return redirect(url_for('paths.dashboard'))
+    return render_template('index.html')
+
+def dashboard_validators():
+    """The user's path count and latest path/progress change"""
+    path_count, paths_updated = db.session.query(
+        func.count(SkillPath.id), func.max(SkillPath.updated_at)
+    ).filter(SkillPath.user_id == session['user_id']).one()
+    progress_count, progress_updated = db.session.query(
+        func.count(Progress.id), func.max(Progress.updated_at)
+    ).join(PathStep, PathStep.id == Progress.step_id).join(SkillPath).filter(
+        SkillPath.user_id == session['user_id']
+    ).one()
+    return (path_count, paths_updated, progress_count, progress_updated), latest(paths_updated, progress_updated)
+
+@bp.route('/dashboard')
+@read_only
+@login_required
+@conditional(dashboard_validators)
+def dashboard():
+    user_paths = SkillPath.query.filter_by(user_id=session['user_id']).order_by(SkillPath.created_at.desc()).all()
+    
+    # Calculate progress for each path
+    paths_with_progress = []
+    for path in user_paths:
+        total_steps = len(path.steps)
+        if total_steps == 0:
+            completion_percentage = 0
+        else:
+            completed_steps = sum(1 for step in path.steps if step.progress and step.progress.status == 'done')
+            completion_percentage = int((completed_steps / total_steps) * 100)
+        
+        paths_with_progress.append({
+            'path': path,
+            'completion_percentage': completion_percentage
+        })
+    
+    return render_template('dashboard.html', paths=paths_with_progress)
+
+def prepare_generation():
+    """Validate the generate form and offer or reuse a similar existing path.
+    
+    Returns the response when the request is answered here, otherwise the
+    generation request (a dict) whose prompt still has to go to the LLM.
+    """
+    career_goal = request.form.get('career_goal')
+    current_level = request.form.get('current_level')
+    interests = request.form.get('interests')
+    weekly_hours = int(request.form.get('weekly_hours', 0))
+    timeline_weeks = int(request.form.get('timeline_weeks', 0))
+    
+    if not all([career_goal, current_level, interests, weekly_hours, timeline_weeks]):
+        flash('All fields are required.', 'error')
+        return render_template('generate_path.html')
+    
+    generation = {
+        'user_id': session['user_id'],
+        'career_goal': career_goal,
+        'current_level': current_level,
+        'interests': interests,
+        'weekly_hours': weekly_hours,
+        'timeline_weeks': timeline_weeks
+    }
+    
+    # Offer a closely matching existing path before spending an LLM call
+    if not request.form.get('skip_similar'):
+        similar = find_similar_path(career_goal, interests, current_level)
+        if similar and request.form.get('reuse_path_id') != similar[0].id:
+            return render_template('generate_path.html',
+                                 similar_path=similar[0],
+                                 similarity=int(similar[1] * 100),
+                                 form=request.form)
+        if similar:
+            ai_response = adapt_generated_content(similar[0].generated_content, career_goal, current_level, interests,
+                                                  weekly_hours, timeline_weeks)
+            return finish_generation(generation, ai_response)
+    
+    # Generate AI learning path, within GENERATION_DEADLINE_SECONDS including any queueing
+    generation['deadline'] = time.monotonic() + current_app.config['GENERATION_DEADLINE_SECONDS']
+    generation['prompt'] = generate_skill_path_prompt(career_goal, current_level, interests, weekly_hours, timeline_weeks)
+    generation['cost'] = estimate_request_tokens(generation['prompt'])
+    return generation
+
+def queue_timeout(generation):
+    """How long the generation may wait for admission without missing its deadline"""
+    return min(current_app.config['GENERATION_QUEUE_TIMEOUT'], generation['deadline'] - time.monotonic())
+
+def finish_generation(generation, ai_response, index_for_reuse=False, upgrade=None):
+    """Save the path, built locally if the AI gave nothing, and redirect to it.
+    
+    ``upgrade`` is called with the saved path's id when a late AI result is
+    still on its way and should replace the path.
+    """
+    # If OpenAI fails or is too slow, build the path locally
+    if not ai_response:
+        ai_response = generate_local_learning_path(generation['career_goal'], generation['current_level'],
+                                                   generation['interests'], generation['weekly_hours'],
+                                                   generation['timeline_weeks'])
+        if upgrade:
+            logging.info("OpenAI missed the generation deadline, serving local path until it arrives")
+            flash('The AI is taking longer than usual, so this path was built from our templates. '
+                  'It will be replaced by the AI version if that arrives before you start.', 'warning')
+        else:
+            logging.info("OpenAI API unavailable, using local path")
+            flash('AI service is temporarily unavailable. This path was built from our templates.', 'warning')
+    
+    # Validate JSON schema
+    is_valid, validation_msg = validate_ai_json_schema(ai_response)
+    if not is_valid:
+        flash(f'Invalid path format: {validation_msg}', 'error')
+        return render_template('generate_path.html')
+    
+    # Create skill path
+    skill_path = SkillPath(
+        user_id=generation['user_id'],
+        title=ai_response['title'],
+        description=ai_response['description'],
+        career_goal=generation['career_goal'],
+        current_level=generation['current_level'],
+        interests=generation['interests'],
+        weekly_hours=generation['weekly_hours'],
+        timeline_weeks=generation['timeline_weeks'],
+        generated_content=ai_response
+    )
+    
+    db.session.add(skill_path)
+    db.session.flush()
+    
+    # Only real AI results are offered to later, similar requests
+    if index_for_reuse:
+        index_skill_path(skill_path)
+    
+    create_path_steps(skill_path, ai_response)
+    
+    db.session.commit()
+    
+    if upgrade:
+        upgrade(skill_path.id)
+    else:
+        flash('Learning path generated successfully!', 'success')
+    return redirect(url_for('paths.path_detail', id=skill_path.id))
+
+@bp.route('/generate_path', methods=['GET', 'POST'])
+@login_required
+def generate_path():
+    """Sync serving mode; under asgi.py POSTs are handled by skillpath.asgi instead"""
+    if request.method == 'POST':
+        generation = prepare_generation()
+        if not isinstance(generation, dict):
+            return generation
+        
+        app = current_app._get_current_object()
+        ai_response = None
+        pending = None
+        admitted = current_app.extensions['generation_scheduler'].acquire(
+            generation['user_id'], generation['cost'], 'interactive', queue_timeout(generation)
+        )
+        if admitted:
+            pending = start_llm_generation(app, generation['prompt'])
+            wait([pending], max(0, generation['deadline'] - time.monotonic()))
+            if pending.done():
+                ai_response = pending.result()
+                pending = None
+        else:
+            logging.info("Generation queue wait exceeded the generation deadline")
+        
+        upgrade = None
+        if pending and current_app.config['GENERATION_BACKGROUND_UPGRADE']:
+            upgrade = lambda skill_path_id: pending.add_done_callback(partial(upgrade_when_ready, app, skill_path_id))
+        return finish_generation(generation, ai_response, index_for_reuse=ai_response is not None, upgrade=upgrade)
+    
+    return render_template('generate_path.html')
+
+@bp.route('/generate_path/queue')
+@login_required
+def generation_queue():
+    """Current generation queue depth and expected wait, polled by the generate page"""
+    return jsonify(current_app.extensions['generation_scheduler'].stats())
+
+def get_resource_icon(resource_type):
+    """Get Font Awesome icon for resource type"""
+    icons = {
+        'course': 'graduation-cap',
+        'video': 'video',
+        'article': 'newspaper',
+        'book': 'book',
+        'tutorial': 'laptop-code',
+        'project': 'project-diagram',
+        'documentation': 'file-alt'
+    }
+    return icons.get(resource_type, 'link')
+
+# Make the helpers available in all templates
+@bp.app_context_processor
+def utility_processor():
+    return {
+        'get_resource_icon': get_resource_icon,
+        'asset_url': asset_url,
+        'now': datetime.utcnow
+    }
+
+def path_detail_validators(id):
+    """Latest change to the path, its steps' progress and their resources"""
+    path = db.session.query(SkillPath.updated_at).filter(
+        SkillPath.id == id, SkillPath.user_id == session['user_id']
+    ).first()
+    if path is None:
+        return None
+    
+    progress_count, progress_updated = db.session.query(
+        func.count(Progress.id), func.max(Progress.updated_at)
+    ).join(PathStep, PathStep.id == Progress.step_id).filter(PathStep.skill_path_id == id).one()
+    resource_count, resources_updated = db.session.query(
+        func.count(StepResource.id), func.max(func.coalesce(Resource.updated_at, Resource.created_at))
+    ).join(Resource).join(PathStep, PathStep.id == StepResource.step_id).filter(PathStep.skill_path_id == id).one()
+    
+    parts = (path.updated_at, progress_count, progress_updated, resource_count, resources_updated)
+    return parts, latest(path.updated_at, progress_updated, resources_updated)
+
+@bp.route('/path/<id>')
+@read_only
+@login_required
+@conditional(path_detail_validators)
+def path_detail(id):
+    skill_path = SkillPath.query.filter_by(id=id, user_id=session['user_id']).first_or_404()
+    
+    # Calculate overall progress
+    total_steps = len(skill_path.steps)
+    completed_steps = sum(1 for step in skill_path.steps if step.progress and step.progress.status == 'done')
+    completion_percentage = int((completed_steps / total_steps) * 100) if total_steps > 0 else 0
+    
+    # Group steps by milestone
+    steps_by_milestone = []
+    current_milestone = None
+    milestone_steps = []
+    
+    for step in sorted(skill_path.steps, key=lambda x: x.step_number):
+        if step.milestone and milestone_steps:
+            steps_by_milestone.append({
+                'milestone': current_milestone,
+                'steps': milestone_steps
+            })
+            milestone_steps = []
+        
+        if step.milestone:
+            current_milestone = step
+        
+        milestone_steps.append(step)
+    
+    if milestone_steps:
+        steps_by_milestone.append({
+            'milestone': current_milestone,
+            'steps': milestone_steps
+        })
+    
+    return render_template('path_detail.html', 
+                         path=skill_path, 
+                         completion_percentage=completion_percentage,
+                         steps_by_milestone=steps_by_milestone)
+
+@bp.route('/path/<id>/feedback', methods=['POST'])
+@login_required
+def submit_feedback(id):
+    """Rate a path 1-5 with an optional comment, replacing any earlier rating; stored in the next feedback batch"""
+    skill_path = SkillPath.query.filter_by(id=id, user_id=session['user_id']).first_or_404()
+    data = request.get_json(silent=True) or {}
+    
+    rating = data.get('rating')
+    if not isinstance(rating, int) or isinstance(rating, bool) or not 1 <= rating <= 5:
+        return jsonify({'success': False, 'message': 'Rating must be an integer from 1 to 5'}), 400
+    comment = (data.get('comment') or '').strip()
+    if len(comment) > 2000:
+        return jsonify({'success': False, 'message': 'Comment must be at most 2000 characters'}), 400
+    
+    if not current_app.extensions['feedback_buffer'].submit(session['user_id'], skill_path, rating, comment or None):
+        return jsonify({'success': False, 'message': 'Feedback is temporarily unavailable, please try again later'}), 503
+    return jsonify({'success': True, 'message': 'Thanks for your feedback!'}), 202
+
+@bp.route('/path/<id>/feedback', methods=['GET'])
+@read_only
+@login_required
+def feedback_summary(id):
+    """Rating summary for a path and for its career goal"""
+    skill_path = SkillPath.query.filter_by(id=id, user_id=session['user_id']).first_or_404()
+    return jsonify({
+        'success': True,
+        'path': get_rating_summary('path', skill_path.id),
+        'career_goal': get_rating_summary('goal', skill_path.career_goal)
+    })
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from flask import Blueprint, request, session, jsonify
+
+from .auth import login_required
+from .extensions import db
+from .models import SkillPath, PathStep, Progress
+
+bp = Blueprint('progress', __name__)
+
+@bp.route('/progress/<step_id>', methods=['POST'])
+@login_required
+def update_progress(step_id):
+    step = PathStep.query.join(SkillPath).filter(
+        PathStep.id == step_id,
+        SkillPath.user_id == session['user_id']
+    ).first_or_404()
+    
+    status = request.json.get('status')
+    if status not in ['todo', 'in_progress', 'done']:
+        return jsonify({'error': 'Invalid status'}), 400
+    
+    if not step.progress:
+        progress = Progress(step_id=step_id, status=status)
+        db.session.add(progress)
+    else:
+        step.progress.status = status
+        if status == 'done':
+            step.progress.completed_at = datetime.utcnow()
+    
+    db.session.commit()
+    
+    # Calculate new completion percentage
+    total_steps = len(step.skill_path.steps)
+    completed_steps = sum(1 for s in step.skill_path.steps if s.progress and s.progress.status == 'done')
+    completion_percentage = int((completed_steps / total_steps) * 100) if total_steps > 0 else 0
+    
+    return jsonify({
+        'success': True,
+        'completion_percentage': completion_percentage
+    })
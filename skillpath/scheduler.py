@@ -0,0 +1,141 @@
+import time
+import asyncio
+import threading
+from collections import deque, OrderedDict
+
+
+class GenerationScheduler:
+    """Admit LLM calls under requests- and tokens-per-minute buckets.
+    
+    Waiting calls are served by priority class first, then round-robin across
+    users, so one user's burst cannot starve everyone else.
+    """
+    
+    PRIORITIES = ('interactive', 'batch')
+    # How often a waiting coroutine rechecks its place in the queue
+    POLL_SECONDS = 0.05
+    
+    def __init__(self, rpm, tpm):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._request_allowance = float(rpm)
+        self._token_allowance = float(tpm)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._queues = {priority: OrderedDict() for priority in self.PRIORITIES}
+        self._cond = threading.Condition()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._request_allowance = min(self.rpm, self._request_allowance + elapsed * self.rpm / 60)
+        self._token_allowance = min(self.tpm, self._token_allowance + elapsed * self.tpm / 60)
+    
+    def _seconds_until_affordable(self, cost):
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        request_shortfall = 1 - self._request_allowance
+        token_shortfall = cost - self._token_allowance
+        return max(0.0, request_shortfall * 60 / self.rpm, token_shortfall * 60 / self.tpm)
+    
+    def _head(self):
+        for priority in self.PRIORITIES:
+            queue = self._queues[priority]
+            if queue:
+                return queue[next(iter(queue))][0]
+        return None
+    
+    def _remove(self, ticket, served=False):
+        queue = self._queues[ticket['priority']]
+        tickets = queue[ticket['user_id']]
+        tickets.remove(ticket)
+        if not tickets:
+            del queue[ticket['user_id']]
+        elif served:
+            # Served users go to the back of the rotation
+            queue.move_to_end(ticket['user_id'])
+    
+    def _enqueue(self, user_id, cost, priority):
+        ticket = {'user_id': user_id, 'cost': min(cost, self.tpm), 'priority': priority}
+        self._queues[priority].setdefault(user_id, deque()).append(ticket)
+        return ticket
+    
+    def _try_admit(self, ticket, deadline):
+        """(True, 0) when admitted, (False, 0) once the deadline passed, else (None, seconds to wait)"""
+        self._refill()
+        is_head = self._head() is ticket
+        wait = self._seconds_until_affordable(ticket['cost']) if is_head else None
+        
+        if is_head and wait == 0:
+            self._request_allowance -= 1
+            self._token_allowance -= ticket['cost']
+            self._remove(ticket, served=True)
+            self._cond.notify_all()
+            return True, 0
+        
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._remove(ticket)
+                self._cond.notify_all()
+                return False, 0
+            wait = remaining if wait is None else min(wait, remaining)
+        return None, wait
+    
+    def acquire(self, user_id, cost, priority='interactive', timeout=None):
+        """Block until this call may run; False if it timed out in the queue"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        
+        with self._cond:
+            ticket = self._enqueue(user_id, cost, priority)
+            while True:
+                admitted, wait = self._try_admit(ticket, deadline)
+                if admitted is not None:
+                    return admitted
+                self._cond.wait(wait)
+    
+    async def acquire_async(self, user_id, cost, priority='interactive', timeout=None):
+        """acquire() for coroutines: waits on the event loop instead of holding a thread"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        
+        with self._cond:
+            ticket = self._enqueue(user_id, cost, priority)
+        try:
+            while True:
+                with self._cond:
+                    admitted, wait = self._try_admit(ticket, deadline)
+                if admitted is not None:
+                    return admitted
+                # Threads waiting in acquire() are notified; coroutines poll
+                await asyncio.sleep(min(wait, self.POLL_SECONDS) if wait is not None else self.POLL_SECONDS)
+        except asyncio.CancelledError:
+            # A dropped request must not stay at the head of the queue
+            with self._cond:
+                self._remove(ticket)
+                self._cond.notify_all()
+            raise
+    
+    def pause(self, seconds):
+        """Stop admitting calls for a while after the provider reports a rate limit"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._request_allowance = min(self._request_allowance, 0)
+    
+    def stats(self):
+        """Queue depth and the wait a newly queued interactive call should expect"""
+        with self._cond:
+            self._refill()
+            tickets = [t for queue in self._queues.values() for user_tickets in queue.values() for t in user_tickets]
+            queued_tokens = sum(t['cost'] for t in tickets)
+            request_wait = (len(tickets) + 1 - self._request_allowance) * 60 / self.rpm
+            token_wait = (queued_tokens - self._token_allowance) * 60 / self.tpm
+            pause_wait = self._paused_until - time.monotonic()
+            return {
+                'queue_depth': len(tickets),
+                'expected_wait_seconds': round(max(0.0, request_wait, token_wait, pause_wait), 1)
+            }
+
+def init_app(app):
+    app.extensions['generation_scheduler'] = GenerationScheduler(app.config['OPENAI_RPM'], app.config['OPENAI_TPM'])
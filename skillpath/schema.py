@@ -0,0 +1,65 @@
+from .auth import hash_password
+from sqlalchemy import func
+
+from .extensions import db
+from .feedback import rebuild_rating_aggregates
+from .models import User, Resource, Feedback
+
+def ensure_content_hash_column():
+    """Add skill_paths.content_hash to databases created before compact storage"""
+    columns = [column['name'] for column in db.inspect(db.engine).get_columns('skill_paths')]
+    if 'content_hash' not in columns:
+        with db.engine.begin() as conn:
+            conn.execute(db.text(
+                'ALTER TABLE skill_paths ADD COLUMN content_hash VARCHAR(64) '
+                'REFERENCES generated_contents (content_hash)'
+            ))
+
+def ensure_resource_updated_at_column():
+    """Add resources.updated_at to databases created before conditional responses"""
+    columns = [column['name'] for column in db.inspect(db.engine).get_columns('resources')]
+    if 'updated_at' not in columns:
+        with db.engine.begin() as conn:
+            conn.execute(db.text('ALTER TABLE resources ADD COLUMN updated_at TIMESTAMP'))
+
+def ensure_indexes():
+    """Create indexes added to existing tables after they were first created"""
+    for index in Resource.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+
+def ensure_feedback_unique_index():
+    """Keep each user's latest rating of a path, then enforce one rating per user and path"""
+    index = next(iter(Feedback.__table__.indexes))
+    if index.name in {existing['name'] for existing in db.inspect(db.engine).get_indexes('feedback')}:
+        return
+    
+    ranked = db.select(Feedback.id, func.row_number().over(
+        partition_by=(Feedback.user_id, Feedback.skill_path_id),
+        order_by=Feedback.created_at.desc()
+    ).label('position')).subquery()
+    stale_ids = [row[0] for row in db.session.query(ranked.c.id).filter(ranked.c.position > 1)]
+    if stale_ids:
+        Feedback.query.filter(Feedback.id.in_(stale_ids)).delete(synchronize_session=False)
+        rebuild_rating_aggregates()
+    index.create(db.engine)
+
+# Initialize database
+def init_db(app):
+    with app.app_context():
+        db.create_all()
+        ensure_content_hash_column()
+        ensure_resource_updated_at_column()
+        ensure_indexes()
+        ensure_feedback_unique_index()
+        
+        # Create admin user if not exists
+        admin_user = User.query.filter_by(username='admin').first()
+        if not admin_user:
+            admin_user = User(
+                username='admin',
+                email='admin@skillpath.com',
+                password_hash=hash_password('admin123'),
+                is_admin=True
+            )
+            db.session.add(admin_user)
+            db.session.commit()
@@ -0,0 +1,249 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+import logging
+import threading
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SecureCookieSession
+from itsdangerous import Signer, BadSignature
+
+class MemorySessionStore:
+    """In-process key/value store with TTLs; a local stand-in for Redis"""
+    
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.time():
+                del self._data[key]
+                return None
+            return item[1]
+    
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+    
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            expired = [key for key, item in self._data.items() if item[0] <= now]
+            for key in expired:
+                del self._data[key]
+        return len(expired)
+
+class FileSystemSessionStore:
+    """Key/value store with TTLs, one file per key, shared by workers on one host"""
+    
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest())
+    
+    def get(self, key):
+        try:
+            with open(self._path(key)) as f:
+                item = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if item['expires_at'] <= time.time():
+            self.delete(key)
+            return None
+        return item['value']
+    
+    def set(self, key, value, ttl):
+        path = self._path(key)
+        tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'expires_at': time.time() + ttl, 'value': value}, f)
+        os.replace(tmp_path, path)
+    
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+    
+    def purge_expired(self):
+        """Remove expired entries, and temp files left behind by interrupted writes"""
+        now = time.time()
+        removed = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith('.tmp'):
+                    expired = os.path.getmtime(path) < now - 3600
+                else:
+                    with open(path) as f:
+                        expired = json.load(f)['expires_at'] <= now
+            except (OSError, ValueError, KeyError):
+                continue
+            
+            if expired:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+class SQLiteSessionStore:
+    """Key/value store with TTLs in a local SQLite file"""
+    
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS kv_expires_at ON kv (expires_at)')
+    
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+    
+    def get(self, key):
+        with self._connect() as conn:
+            row = conn.execute('SELECT value, expires_at FROM kv WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= time.time():
+            self.delete(key)
+            return None
+        return row[0]
+    
+    def set(self, key, value, ttl):
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)',
+                         (key, value, time.time() + ttl))
+    
+    def delete(self, key):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM kv WHERE key = ?', (key,))
+    
+    def purge_expired(self):
+        with self._connect() as conn:
+            return conn.execute('DELETE FROM kv WHERE expires_at <= ?', (time.time(),)).rowcount
+
+def make_session_store(config):
+    kind = config['SESSION_STORE']
+    if kind == 'memory':
+        return MemorySessionStore()
+    if kind == 'sqlite':
+        return SQLiteSessionStore(config['SESSION_SQLITE_PATH'])
+    if kind == 'filesystem':
+        return FileSystemSessionStore(config['SESSION_DIR'])
+    raise ValueError(f'Unknown SESSION_STORE: {kind}')
+
+class ServerSideSession(SecureCookieSession):
+    def __init__(self, initial=None, sid=None, new=False):
+        super().__init__(initial)
+        self.sid = sid
+        self.new = new
+        self.stale_sid = None
+    
+    def regenerate(self):
+        """Move the session to a fresh id, so an id known before login or logout is worthless after it"""
+        if not self.new and self.stale_sid is None:
+            self.stale_sid = self.sid
+        self.sid = uuid.uuid4().hex
+        self.modified = True
+
+class ServerSideSessionInterface(SessionInterface):
+    """Keep session data in a session store; the cookie only carries a signed session id"""
+    
+    serializer = TaggedJSONSerializer()
+    
+    def __init__(self, store):
+        self.store = store
+        self._next_purge_at = 0.0
+        self._purge_lock = threading.Lock()
+    
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='server-side-session')
+    
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode('utf-8')
+            except BadSignature:
+                sid = None
+            
+            data = self.store.get(f'session:{sid}') if sid else None
+            if data is not None:
+                return ServerSideSession(self.serializer.loads(data), sid=sid)
+        
+        return ServerSideSession(sid=uuid.uuid4().hex, new=True)
+    
+    def purge_expired(self):
+        try:
+            removed = self.store.purge_expired()
+            logging.info(f"Purged {removed} expired session entries")
+        except Exception as e:
+            logging.error(f"Purging expired sessions failed: {str(e)}")
+    
+    def purge_if_due(self, app):
+        """Purge expired entries in the background at most once per SESSION_PURGE_INTERVAL_SECONDS"""
+        interval = app.config['SESSION_PURGE_INTERVAL_SECONDS']
+        now = time.monotonic()
+        with self._purge_lock:
+            if interval <= 0 or now < self._next_purge_at:
+                return
+            self._next_purge_at = now + interval
+        threading.Thread(target=self.purge_expired, name='session-purge', daemon=True).start()
+    
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if session.accessed:
+            response.vary.add('Cookie')
+        
+        self.purge_if_due(app)
+        if session.stale_sid:
+            self.store.delete(f'session:{session.stale_sid}')
+        
+        if not session:
+            if session.modified:
+                self.store.delete(f'session:{session.sid}')
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+        
+        if not (session.modified or session.new or self.should_set_cookie(app, session)):
+            return
+        
+        # Sessions nobody has logged into (flash messages for a bot, say) are not kept for long
+        if 'user_id' in session:
+            ttl = int(app.permanent_session_lifetime.total_seconds())
+        else:
+            ttl = app.config['ANONYMOUS_SESSION_TTL_SECONDS']
+        self.store.set(f'session:{session.sid}', self.serializer.dumps(dict(session)), ttl)
+        response.set_cookie(
+            name,
+            self._signer(app).sign(session.sid.encode('utf-8')).decode('utf-8'),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+
+def init_app(app):
+    store = make_session_store(app.config)
+    app.extensions['session_store'] = store
+    app.session_interface = ServerSideSessionInterface(store)
@@ -0,0 +1,129 @@
+import re
+import json
+import struct
+import random
+import hashlib
+
+from flask import current_app
+from sqlalchemy import func
+
+from .extensions import db
+from .local_generator import TITLE_GOAL_LENGTH, path_description, shorten
+from .models import SkillPath, PathSignature, PathLshBucket, RatingAggregate
+
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+# Candidates scored per lookup, taken in order of how many bands they share with the request
+LSH_MAX_CANDIDATES = 200
+MINHASH_PRIME = (1 << 61) - 1
+# Fixed seed so signatures stay comparable across processes and restarts
+_minhash_rng = random.Random(20240101)
+MINHASH_PARAMS = [
+    (_minhash_rng.randrange(1, MINHASH_PRIME), _minhash_rng.randrange(0, MINHASH_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+ABBREVIATIONS = {
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'ux': 'user experience',
+    'ui': 'user interface',
+    'qa': 'quality assurance',
+    'js': 'javascript',
+    'db': 'database',
+    'sre': 'site reliability engineer',
+    'dev': 'developer',
+    'eng': 'engineer'
+}
+
+def normalize_text(text):
+    """Lowercase, drop punctuation and expand common abbreviations"""
+    words = re.sub(r'[^a-z0-9+#]+', ' ', (text or '').lower()).split()
+    return ' '.join(ABBREVIATIONS.get(word, word) for word in words)
+
+def path_shingles(career_goal, interests):
+    """Character 4-grams of the normalized goal and interests, tagged by field"""
+    shingles = set()
+    for field, text in (('goal', career_goal), ('interests', interests)):
+        normalized = normalize_text(text)
+        for i in range(max(1, len(normalized) - 3)):
+            shingles.add(f'{field}:{normalized[i:i + 4]}')
+    return shingles
+
+def minhash_signature(shingles):
+    hashes = [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+              for shingle in shingles]
+    return [min((a * h + b) % MINHASH_PRIME for h in hashes) for a, b in MINHASH_PARAMS]
+
+def lsh_bucket_keys(signature, current_level):
+    """One bucket per band; the level is part of the key so only same-level paths collide"""
+    level = normalize_text(current_level)
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f'>{LSH_ROWS}Q', *rows), digest_size=8).hexdigest()
+        keys.append(f'{level}:{band}:{digest}')
+    return keys
+
+def index_skill_path(skill_path):
+    """Store the path's signature and LSH buckets so later requests can find it"""
+    signature = minhash_signature(path_shingles(skill_path.career_goal, skill_path.interests))
+    skill_path.signature = PathSignature(
+        skill_path_id=skill_path.id,
+        signature=struct.pack(f'>{MINHASH_PERMUTATIONS}Q', *signature)
+    )
+    skill_path.lsh_buckets = [
+        PathLshBucket(bucket_key=key, skill_path_id=skill_path.id)
+        for key in lsh_bucket_keys(signature, skill_path.current_level)
+    ]
+
+def find_similar_path(career_goal, interests, current_level):
+    """Return (skill_path, similarity) for the closest indexed path above the threshold, or None"""
+    signature = minhash_signature(path_shingles(career_goal, interests))
+    # Paths sharing more bands are likelier to be close, so popular goals don't crowd out the best match
+    band_matches = func.count(PathLshBucket.id)
+    candidate_ids = [row[0] for row in db.session.query(PathLshBucket.skill_path_id).filter(
+        PathLshBucket.bucket_key.in_(lsh_bucket_keys(signature, current_level))
+    ).group_by(PathLshBucket.skill_path_id).order_by(band_matches.desc()).limit(LSH_MAX_CANDIDATES)]
+    if not candidate_ids:
+        return None
+    
+    # Paths users rated poorly are not offered again
+    poorly_rated = {row[0] for row in db.session.query(RatingAggregate.scope_key).filter(
+        RatingAggregate.scope == 'path',
+        RatingAggregate.scope_key.in_(candidate_ids),
+        RatingAggregate.count >= current_app.config['FEEDBACK_MIN_VOTES'],
+        RatingAggregate.total < RatingAggregate.count * current_app.config['FEEDBACK_MIN_REUSE_RATING']
+    )}
+    
+    best_id, best_similarity = None, 0.0
+    for candidate in PathSignature.query.filter(PathSignature.skill_path_id.in_(candidate_ids)):
+        if candidate.skill_path_id in poorly_rated:
+            continue
+        candidate_signature = struct.unpack(f'>{MINHASH_PERMUTATIONS}Q', candidate.signature)
+        similarity = sum(1 for x, y in zip(signature, candidate_signature) if x == y) / MINHASH_PERMUTATIONS
+        if similarity > best_similarity:
+            best_id, best_similarity = candidate.skill_path_id, similarity
+    
+    if best_similarity < current_app.config['SIMILAR_PATH_THRESHOLD']:
+        return None
+    return db.session.get(SkillPath, best_id), best_similarity
+
+def adapt_generated_content(content, career_goal, current_level, interests, weekly_hours, timeline_weeks):
+    """Copy an existing path's steps for a new request, rescaled to its timeline.
+    
+    The title, description and milestones are rewritten from the new request, since the
+    originals were generated for another user and tend to repeat their interests.
+    """
+    adapted = json.loads(json.dumps(content))
+    adapted['title'] = f"Comprehensive Learning Path for {shorten(career_goal, TITLE_GOAL_LENGTH)}"
+    adapted['description'] = path_description(len(adapted['steps']), career_goal, current_level, interests,
+                                               weekly_hours, timeline_weeks)
+    adapted['milestones'] = [step['title'] for step in adapted['steps'] if step.get('milestone')]
+    
+    total_weeks = sum(step.get('duration_weeks') or 1 for step in adapted['steps'])
+    for step in adapted['steps']:
+        step['duration_weeks'] = max(1, round((step.get('duration_weeks') or 1) * timeline_weeks / total_weeks))
+    
+    return adapted
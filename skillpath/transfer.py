@@ -0,0 +1,346 @@
+import io
+import csv
+import gzip
+import json
+import uuid
+import zlib
+from collections import defaultdict
+from datetime import datetime
+
+from .extensions import db
+from .models import User, SkillPath, PathStep, Resource, StepResource, Progress, canonicalize_url
+
+# Per-row errors returned in an import report; the total is always counted
+MAX_REPORTED_ERRORS = 1000
+
+# Path Export / Import
+# Record types in dependency order, so an import never references a row it has not seen yet
+EXPORT_TABLES = [
+    ('resource', Resource),
+    ('skill_path', SkillPath),
+    ('path_step', PathStep),
+    ('progress', Progress),
+    ('step_resource', StepResource)
+]
+# generated_content is rebuilt from the exported steps on demand
+EXPORT_EXCLUDED_COLUMNS = {'generated_content', 'content_hash'}
+
+def export_query(model, user_id=None):
+    columns = [column for column in model.__table__.columns if column.name not in EXPORT_EXCLUDED_COLUMNS]
+    query = db.select(*columns)
+    if not user_id:
+        return query
+    
+    if model is SkillPath:
+        return query.where(SkillPath.user_id == user_id)
+    if model is Resource:
+        query = query.join(StepResource, StepResource.resource_id == Resource.id).join(
+            PathStep, PathStep.id == StepResource.step_id).distinct()
+    elif model is not PathStep:
+        query = query.join(PathStep, PathStep.id == model.step_id)
+    return query.join(SkillPath, SkillPath.id == PathStep.skill_path_id).where(SkillPath.user_id == user_id)
+
+def iter_export_records(user_id=None):
+    """Yield export records one at a time, fetched from the database in chunks"""
+    for record_type, model in EXPORT_TABLES:
+        result = db.session.execute(export_query(model, user_id).execution_options(stream_results=True, yield_per=1000))
+        for row in result:
+            record = {'record': record_type}
+            for key, value in row._mapping.items():
+                record[key] = value.isoformat() if isinstance(value, datetime) else value
+            yield record
+
+def export_ndjson_chunks(records, compress=False):
+    """Encode records as NDJSON in ~64KB chunks, optionally gzip-compressed"""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n'
+        buffer.append(line)
+        size += len(line)
+        if size >= 65536:
+            data = b''.join(buffer)
+            buffer, size = [], 0
+            yield compressor.compress(data) if compressor else data
+    
+    data = b''.join(buffer)
+    if compressor:
+        yield compressor.compress(data) + compressor.flush()
+    elif data:
+        yield data
+
+def parse_export_line(line, models):
+    """Return (model, record) for one export line; ValueError if it cannot be imported"""
+    try:
+        # Undecodable bytes arrive as lone surrogates (errors='surrogateescape')
+        line.encode('utf-8')
+    except UnicodeEncodeError:
+        raise ValueError('Line is not valid UTF-8')
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f'Invalid JSON: {e}')
+    if not isinstance(record, dict):
+        raise ValueError('Line is not a JSON object')
+    
+    record_type = record.pop('record', None)
+    model = models.get(record_type) if isinstance(record_type, str) else None
+    if model is None:
+        raise ValueError(f'Unknown record type: {record_type!r}')
+    if not record.get('id'):
+        raise ValueError('Missing id')
+    
+    for column in model.__table__.columns:
+        if isinstance(column.type, db.DateTime) and record.get(column.name):
+            if not isinstance(record[column.name], str):
+                raise ValueError(f'{column.name} must be an ISO 8601 string')
+            record[column.name] = datetime.fromisoformat(record[column.name])
+    return model, record
+
+def import_records(lines, batch_size=1000):
+    """Bulk-insert NDJSON export lines in batches; rows that already exist are skipped.
+    
+    Lines that cannot be parsed are reported by line number and skipped rather than ending the import.
+    """
+    models = dict(EXPORT_TABLES)
+    counts = defaultdict(int)
+    errors = []
+    # Children of paths whose owner is missing here are skipped too
+    skipped_paths = set()
+    skipped_steps = set()
+    
+    def flush(model, batch):
+        ids = [row['id'] for row in batch]
+        existing = {row[0] for row in db.session.query(model.id).filter(model.id.in_(ids))}
+        rows = [row for row in batch if row['id'] not in existing]
+        
+        if model is SkillPath:
+            user_ids = {row[0] for row in db.session.query(User.id).filter(User.id.in_({r['user_id'] for r in rows}))}
+            skipped_paths.update(row['id'] for row in rows if row['user_id'] not in user_ids)
+            rows = [row for row in rows if row['user_id'] in user_ids]
+        elif model is PathStep:
+            skipped_steps.update(row['id'] for row in rows if row['skill_path_id'] in skipped_paths)
+            rows = [row for row in rows if row['skill_path_id'] not in skipped_paths]
+        elif model in (Progress, StepResource):
+            rows = [row for row in rows if row['step_id'] not in skipped_steps]
+        
+        if rows:
+            db.session.execute(model.__table__.insert(), rows)
+            db.session.commit()
+        counts[model.__tablename__] += len(rows)
+        counts['skipped'] += len(batch) - len(rows)
+    
+    current_model, batch = None, []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            model, record = parse_export_line(line, models)
+        except ValueError as e:
+            counts['error_count'] += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'line': line_number, 'error': str(e)})
+            continue
+        
+        if model is not current_model or len(batch) >= batch_size:
+            if batch:
+                flush(current_model, batch)
+            current_model, batch = model, []
+        batch.append(record)
+    
+    if batch:
+        flush(current_model, batch)
+    
+    return {**counts, 'error_count': counts['error_count'], 'errors': errors}
+
+def open_import_stream(stream, filename, errors='strict'):
+    """Wrap a binary upload or file as text lines, decompressing .gz input"""
+    if filename.endswith('.gz'):
+        stream = gzip.GzipFile(fileobj=stream)
+    return io.TextIOWrapper(stream, encoding='utf-8', errors=errors)
+
+# Bulk Resource Import
+RESOURCE_TYPES = {'course', 'video', 'article', 'book', 'tutorial', 'project', 'documentation'}
+
+def iter_resource_rows(lines, filename):
+    """Yield (raw row dict, None) or (None, parse error) per row of CSV (with a header row) or JSONL input.
+    
+    A row that cannot be parsed is reported and skipped rather than ending the import.
+    """
+    if filename.endswith(('.jsonl', '.ndjson', '.jsonl.gz', '.ndjson.gz')):
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError as e:
+                yield None, f'Invalid JSON: {e}'
+                continue
+            if not isinstance(raw, dict):
+                yield None, 'Row is not a JSON object'
+                continue
+            yield raw, None
+    else:
+        reader = csv.DictReader(lines)
+        while True:
+            try:
+                raw = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield None, f'Invalid CSV: {e}'
+                continue
+            yield raw, None
+
+def text_field(raw, name):
+    """A stripped string field; ValueError if it is not text or holds bytes that were not UTF-8"""
+    value = raw.get(name)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise ValueError(f'{name} must be a string')
+    try:
+        # Undecodable bytes arrive as lone surrogates (errors='surrogateescape')
+        value.encode('utf-8')
+    except UnicodeEncodeError:
+        raise ValueError(f'{name} is not valid UTF-8')
+    return value.strip()
+
+def validate_resource_row(raw):
+    """Return (row, None) with the URL and type in canonical form, or (None, error message)"""
+    try:
+        title, url, resource_type, category, description = (
+            text_field(raw, name) for name in ('title', 'url', 'type', 'category', 'description')
+        )
+    except ValueError as e:
+        return None, str(e)
+    
+    if not title:
+        return None, 'Missing title'
+    if len(title) > 200:
+        return None, 'Title longer than 200 characters'
+    
+    url = canonicalize_url(url)
+    if not url:
+        return None, 'Missing or invalid http(s) URL'
+    if len(url) > 500:
+        return None, 'URL longer than 500 characters'
+    
+    resource_type = resource_type.lower()
+    if resource_type not in RESOURCE_TYPES:
+        return None, f'Unknown type: {resource_type or "(empty)"}'
+    
+    if len(category) > 100:
+        return None, 'Category longer than 100 characters'
+    
+    return {
+        'title': title,
+        'url': url,
+        'type': resource_type,
+        'category': category,
+        'description': description
+    }, None
+
+def write_resource_rows(rows):
+    """Insert new resources with COPY on Postgres, executemany elsewhere"""
+    now = datetime.utcnow()
+    for row in rows:
+        row['id'] = str(uuid.uuid4())
+        row['created_at'] = now
+        row['updated_at'] = now
+    
+    columns = ['id', 'title', 'url', 'type', 'description', 'category', 'created_at', 'updated_at']
+    connection = db.session.connection()
+    if connection.dialect.name == 'postgresql':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([row[column] for column in columns])
+        buffer.seek(0)
+        cursor = connection.connection.cursor()
+        cursor.copy_expert(f"COPY resources ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    else:
+        db.session.execute(Resource.__table__.insert(), rows)
+
+def import_resources(raw_rows, batch_size=5000):
+    """Validate, dedupe against existing URLs and insert resources in batches"""
+    report = {'imported': 0, 'duplicates': 0, 'error_count': 0, 'errors': []}
+    seen_urls = set()
+    batch = []
+    
+    def flush():
+        existing = {row[0] for row in db.session.query(Resource.url).filter(Resource.url.in_([r['url'] for r in batch]))}
+        new_rows = [row for row in batch if row['url'] not in existing]
+        if new_rows:
+            write_resource_rows(new_rows)
+            db.session.commit()
+        report['imported'] += len(new_rows)
+        report['duplicates'] += len(batch) - len(new_rows)
+        batch.clear()
+    
+    for row_number, (raw, error) in enumerate(raw_rows, start=1):
+        if not error:
+            row, error = validate_resource_row(raw)
+        if error:
+            report['error_count'] += 1
+            if len(report['errors']) < MAX_REPORTED_ERRORS:
+                report['errors'].append({'row': row_number, 'error': error})
+            continue
+        
+        # Duplicates within the upload itself
+        if row['url'] in seen_urls:
+            report['duplicates'] += 1
+            continue
+        seen_urls.add(row['url'])
+        
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+    
+    if batch:
+        flush()
+    
+    return report
+
+def merge_resource(duplicate_id, survivor_id):
+    """Move a duplicate resource's step links to the survivor and delete it"""
+    survivor_steps = db.select(StepResource.step_id).where(StepResource.resource_id == survivor_id)
+    # A step linked to both keeps its one link to the survivor
+    StepResource.query.filter(
+        StepResource.resource_id == duplicate_id, StepResource.step_id.in_(survivor_steps)
+    ).delete(synchronize_session=False)
+    StepResource.query.filter_by(resource_id=duplicate_id).update(
+        {'resource_id': survivor_id}, synchronize_session=False
+    )
+    Resource.query.filter_by(id=survivor_id).update({'updated_at': datetime.utcnow()}, synchronize_session=False)
+    Resource.query.filter_by(id=duplicate_id).delete(synchronize_session=False)
+
+def canonicalize_resource_urls(batch_size=500):
+    """Rewrite stored URLs in canonical form, merging resources that turn out to share one; returns (rewritten, merged)"""
+    rewritten = merged = 0
+    last_id = ''
+    while True:
+        batch = db.session.query(Resource.id, Resource.url).filter(
+            Resource.id > last_id
+        ).order_by(Resource.id).limit(batch_size).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        
+        for resource_id, url in batch:
+            canonical = canonicalize_url(url)
+            if not canonical or canonical == url:
+                continue
+            survivor = db.session.query(Resource.id).filter(
+                Resource.url == canonical, Resource.id != resource_id
+            ).order_by(Resource.created_at).first()
+            if survivor:
+                merge_resource(resource_id, survivor.id)
+                merged += 1
+            else:
+                Resource.query.filter_by(id=resource_id).update({'url': canonical}, synchronize_session=False)
+                rewritten += 1
+        db.session.commit()
+    
+    return rewritten, merged
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The app on a throwaway SQLite database, with cheap password hashing"""
+    settings = {
+        'DATABASE_URL': f"sqlite:///{tmp_path / 'test.sqlite3'}?timeout=30",
+        'SESSION_DIR': str(tmp_path / 'sessions'),
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        'PASSWORD_HASH_WORKERS': '0'
+    }
+    for key, value in settings.items():
+        monkeypatch.setenv(key, value)
+    
+    from skillpath import create_app
+    from skillpath.schema import init_db
+    app = create_app()
+    # The repository keeps its templates in temlates/
+    app.template_folder = os.path.join(PROJECT_ROOT, 'temlates')
+    init_db(app)
+    yield app
+    
+    from skillpath.extensions import db
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def admin_client(app):
+    client = app.test_client()
+    response = client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    assert response.status_code == 302
+    return client
@@ -0,0 +1,19 @@
+import gzip
+
+def test_refused_encodings_are_not_served(app, tmp_path):
+    dist = tmp_path / 'static' / 'dist'
+    dist.mkdir(parents=True)
+    (dist / 'app.0123456789.js').write_bytes(b'let a=1;')
+    (dist / 'app.0123456789.js.gz').write_bytes(gzip.compress(b'let a=1;'))
+    app.static_folder = str(tmp_path / 'static')
+    client = app.test_client()
+
+    def encoding(accept):
+        response = client.get('/static/dist/app.0123456789.js', headers={'Accept-Encoding': accept})
+        assert response.status_code == 200
+        return response.headers.get('Content-Encoding')
+
+    assert encoding('gzip, deflate') == 'gzip'
+    assert encoding('gzip;q=0, deflate') is None
+    assert encoding('*;q=0.5') == 'gzip'
+    assert encoding('identity') is None
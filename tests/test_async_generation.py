@@ -0,0 +1,108 @@
+import asyncio
+import time
+from urllib.parse import urlencode
+
+from skillpath import asgi
+from skillpath.local_generator import generate_local_learning_path
+from skillpath.models import SkillPath
+from skillpath.scheduler import GenerationScheduler
+
+FORM = {
+    'career_goal': 'Data Scientist',
+    'current_level': 'beginner',
+    'interests': 'statistics',
+    'weekly_hours': '10',
+    'timeline_weeks': '12',
+    'skip_similar': '1'
+}
+
+class FakeLLM:
+    """Answers after a delay, recording how many calls were in flight at once"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, prompt):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.seconds)
+        self.in_flight -= 1
+        path = generate_local_learning_path('Data Scientist', 'beginner', 'statistics', 10, 12)
+        path['title'] = 'AI Path'
+        return path
+
+def session_cookie(app):
+    client = app.test_client()
+    assert client.post('/login', data={'username': 'admin', 'password': 'admin123'}).status_code == 302
+    name = app.config['SESSION_COOKIE_NAME']
+    return f'{name}={client.get_cookie(name).value}'
+
+async def post(asgi_app, path, form, cookie):
+    """One request straight through the ASGI app; returns the status and headers"""
+    messages = [{'type': 'http.request', 'body': urlencode(form).encode('utf-8'), 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': 'POST', 'scheme': 'http', 'path': path,
+        'root_path': '', 'query_string': b'', 'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+        'headers': [(b'content-type', b'application/x-www-form-urlencoded'), (b'cookie', cookie.encode('latin-1'))]
+    }
+    await asgi_app(scope, receive, send)
+    return sent[0]['status'], dict(sent[0]['headers'])
+
+def test_generations_wait_on_the_llm_without_holding_threads(app, monkeypatch):
+    llm = FakeLLM(0.5)
+    monkeypatch.setattr(asgi, 'acall_openai_api', llm)
+    app.extensions['generation_scheduler'] = GenerationScheduler(rpm=10 ** 6, tpm=10 ** 9)
+    asgi_app = asgi.create_asgi_app(app)
+    cookie = session_cookie(app)
+
+    async def generate_all():
+        return await asyncio.gather(*(post(asgi_app, '/generate_path', FORM, cookie) for _ in range(40)))
+
+    started = time.monotonic()
+    results = asyncio.run(generate_all())
+    elapsed = time.monotonic() - started
+
+    assert [status for status, _ in results] == [302] * 40
+    assert all(headers[b'location'].startswith(b'/path/') for _, headers in results)
+    # All 40 calls were awaited together while at most ASYNC_DB_WORKERS threads did database work
+    assert llm.peak == 40
+    assert len(asgi_app.db_pool._threads) <= app.config['ASYNC_DB_WORKERS']
+    assert elapsed < 40 * llm.seconds / 2
+    with app.app_context():
+        assert SkillPath.query.filter_by(title='AI Path').count() == 40
+
+def test_late_result_upgrades_the_local_path(app, monkeypatch):
+    monkeypatch.setattr(asgi, 'acall_openai_api', FakeLLM(0.5))
+    app.config['GENERATION_DEADLINE_SECONDS'] = 0.1
+    asgi_app = asgi.create_asgi_app(app)
+    cookie = session_cookie(app)
+
+    async def generate_and_wait():
+        result = await post(asgi_app, '/generate_path', FORM, cookie)
+        with app.app_context():
+            served_title = SkillPath.query.one().title
+        await asyncio.sleep(1)
+        return result, served_title
+
+    (status, headers), served_title = asyncio.run(generate_and_wait())
+    asgi_app.db_pool.shutdown(wait=True)
+
+    assert status == 302
+    assert served_title != 'AI Path'
+    with app.app_context():
+        assert SkillPath.query.one().title == 'AI Path'
+
+def test_anonymous_generation_redirects_to_login(app):
+    status, headers = asyncio.run(post(asgi.create_asgi_app(app), '/generate_path', FORM, 'session=missing'))
+    assert status == 302
+    assert headers[b'location'].endswith(b'/login')
@@ -0,0 +1,105 @@
+import time
+import threading
+import uuid
+
+from skillpath.extensions import db
+from skillpath.models import User, SkillPath, PathStep, Resource, StepResource, Progress
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def create_catalogue(app, resources):
+    """A path the admin reads, plus `resources` resources each linked to a step of another path"""
+    with app.app_context():
+        admin = User.query.filter_by(username='admin').one()
+        read_path = SkillPath(user_id=admin.id, title='Read path', career_goal='Data Scientist',
+                              current_level='beginner', weekly_hours=10, timeline_weeks=12)
+        bulk_path = SkillPath(user_id=admin.id, title='Bulk path', career_goal='Web Developer',
+                              current_level='beginner', weekly_hours=10, timeline_weeks=12)
+        db.session.add_all([read_path, bulk_path])
+        db.session.flush()
+        for number in range(1, 6):
+            step = PathStep(skill_path_id=read_path.id, step_number=number, title=f'Step {number}', duration_weeks=2)
+            step.progress = Progress()
+            step.step_resources = [StepResource(resource=Resource(title=f'Kept {number}', url=f'https://kept.example/{number}',
+                                                                  type='article'))]
+            db.session.add(step)
+        bulk_steps = [PathStep(id=str(uuid.uuid4()), skill_path_id=bulk_path.id, step_number=number, title=f'Bulk {number}')
+                      for number in range(1, 11)]
+        db.session.add_all(bulk_steps)
+        db.session.commit()
+        
+        resource_ids = [str(uuid.uuid4()) for _ in range(resources)]
+        for start in range(0, resources, 10000):
+            chunk = resource_ids[start:start + 10000]
+            db.session.execute(Resource.__table__.insert(), [
+                {'id': resource_id, 'title': f'Resource {resource_id}', 'url': f'https://bulk.example/{resource_id}',
+                 'type': 'article'}
+                for resource_id in chunk
+            ])
+            db.session.execute(StepResource.__table__.insert(), [
+                {'id': str(uuid.uuid4()), 'step_id': bulk_steps[i % len(bulk_steps)].id, 'resource_id': resource_id}
+                for i, resource_id in enumerate(chunk)
+            ])
+        db.session.commit()
+        return read_path.id, resource_ids
+
+def test_reader_latency_stays_flat_during_bulk_delete(app, admin_client):
+    app.config['BULK_DELETE_BATCH_SIZE'] = 2000
+    app.config['BULK_DELETE_PAUSE_SECONDS'] = 0.02
+    path_id, resource_ids = create_catalogue(app, 50000)
+    
+    reader = app.test_client()
+    reader.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    
+    # Failures inside the reader thread would not fail the test, so they are collected and checked after join()
+    statuses = []
+    
+    def read(latencies, stop):
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                statuses.append(reader.get(f'/path/{path_id}').status_code)
+            except Exception as e:
+                statuses.append(repr(e))
+                return
+            latencies.append(time.perf_counter() - started)
+    
+    # Baseline reader latency with no deletion running
+    baseline, stop = [], threading.Event()
+    thread = threading.Thread(target=read, args=(baseline, stop))
+    thread.start()
+    time.sleep(1.5)
+    stop.set()
+    thread.join()
+    assert statuses and set(statuses) == {200}
+    
+    # 50k resources plus their 50k step links: 100k rows
+    response = admin_client.post('/admin/resources/bulk_delete', json={'resource_ids': resource_ids})
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    
+    during, stop = [], threading.Event()
+    thread = threading.Thread(target=read, args=(during, stop))
+    thread.start()
+    started = time.monotonic()
+    while True:
+        job = admin_client.get(f'/admin/jobs/{job_id}').get_json()['job']
+        if job['status'] in ('done', 'failed') or time.monotonic() - started > 120:
+            break
+        time.sleep(0.2)
+    stop.set()
+    thread.join()
+    
+    assert set(statuses) == {200}
+    assert job['status'] == 'done'
+    assert job['processed'] == len(resource_ids)
+    with app.app_context():
+        assert Resource.query.filter(Resource.url.like('https://bulk.example/%')).count() == 0
+        assert StepResource.query.count() == 5
+    
+    # Each batch holds its locks briefly, so readers keep their usual latency
+    assert len(during) >= 20
+    baseline_p99 = percentile(baseline, 99)
+    assert percentile(during, 99) < max(3 * baseline_p99, baseline_p99 + 0.25)
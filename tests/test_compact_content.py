@@ -0,0 +1,35 @@
+import json
+
+from skillpath.extensions import db
+from skillpath.local_generator import generate_local_learning_path
+from skillpath.models import SkillPath, User
+
+def test_migrated_rows_store_sql_null(app):
+    with app.app_context():
+        admin = User.query.filter_by(username='admin').one()
+        content = generate_local_learning_path('Data Scientist', 'beginner', 'statistics', 10, 12)
+        paths = [SkillPath(user_id=admin.id, title=f'Path {i}', career_goal='Data Scientist',
+                           current_level='beginner', weekly_hours=10, timeline_weeks=12) for i in range(3)]
+        db.session.add_all(paths)
+        db.session.commit()
+        ids = [path.id for path in paths]
+        # Two paths from before compact storage, one cleared to JSON 'null' by an earlier run
+        for path_id in ids[:2]:
+            db.session.execute(db.text('UPDATE skill_paths SET generated_content = :content WHERE id = :id'),
+                               {'content': json.dumps(content), 'id': path_id})
+        paths[2].generated_content = content
+        db.session.flush()
+        db.session.execute(db.text("UPDATE skill_paths SET generated_content = 'null' WHERE id = :id"),
+                           {'id': ids[2]})
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['compact-generated-content'])
+
+    assert result.exit_code == 0, result.output
+    assert 'Migrated 2 paths' in result.output
+    assert 'Cleared 1 previously migrated rows to SQL NULL' in result.output
+    assert 'Memory to load a path' in result.output
+    with app.app_context():
+        stored = db.session.execute(db.text('SELECT generated_content FROM skill_paths')).scalars().all()
+        assert stored == [None, None, None]
+        assert all(db.session.get(SkillPath, path_id).generated_content['steps'] for path_id in ids)
@@ -0,0 +1,47 @@
+import io
+
+from skillpath.extensions import db
+from skillpath.models import User, SkillPath, PathStep, Progress
+
+def create_path(app):
+    with app.app_context():
+        admin = User.query.filter_by(username='admin').one()
+        path = SkillPath(user_id=admin.id, title='Path', career_goal='Data Scientist', current_level='beginner',
+                         weekly_hours=5, timeline_weeks=4)
+        path.steps = [PathStep(step_number=i, title=f'Step {i}', duration_weeks=1, progress=Progress())
+                      for i in (1, 2, 3)]
+        db.session.add(path)
+        db.session.commit()
+        return path.id
+
+def test_bad_lines_are_reported_and_the_rest_imported(app, admin_client):
+    path_id = create_path(app)
+    exported = admin_client.get('/admin/export').get_data()
+    with app.app_context():
+        db.session.delete(db.session.get(SkillPath, path_id))
+        db.session.commit()
+
+    lines = exported.splitlines()
+    upload = b'\n'.join([
+        lines[0],
+        b'{"record": "path_step", "id": ',
+        b'{"record": "bogus", "id": "x"}',
+        b'["not", "an", "object"]',
+        b'{"record": "skill_path", "id": "caf\xe9", "title": "Latin-1"}',
+        b'{"record": "progress", "id": "p", "updated_at": "yesterday"}',
+        *lines[1:]
+    ]) + b'\n'
+    response = admin_client.post('/admin/import', data={'file': (io.BytesIO(upload), 'paths.ndjson')},
+                                 content_type='multipart/form-data')
+
+    assert response.status_code == 200
+    counts = response.get_json()['counts']
+    assert counts['error_count'] == 5
+    assert [error['line'] for error in counts['errors']] == [2, 3, 4, 5, 6]
+    assert counts['errors'][1]['error'] == "Unknown record type: 'bogus'"
+    assert counts['errors'][3]['error'] == 'Line is not valid UTF-8'
+    with app.app_context():
+        path = db.session.get(SkillPath, path_id)
+        assert [step.title for step in sorted(path.steps, key=lambda step: step.step_number)] == \
+            ['Step 1', 'Step 2', 'Step 3']
+        assert all(step.progress for step in path.steps)
@@ -0,0 +1,86 @@
+import time
+import random
+
+from skillpath.auth import hash_password
+from skillpath.extensions import db
+from skillpath.feedback import compare_rating_aggregates, rebuild_rating_aggregates, get_rating_summary
+from skillpath.models import User, SkillPath, Feedback
+
+GOALS = ['Data Scientist', 'data  scientist', 'Web Developer', 'DevOps Engineer']
+
+def create_users_and_paths(app, users, paths_per_user):
+    """Users who each own a few paths; returns [(username, [path ids])]"""
+    owners = []
+    with app.app_context():
+        password_hash = hash_password('password')
+        for i in range(users):
+            user = User(username=f'rater{i}', email=f'rater{i}@example.com', password_hash=password_hash)
+            user.skill_paths = [
+                SkillPath(title=f'Path {j}', career_goal=GOALS[(i + j) % len(GOALS)], current_level='beginner',
+                          weekly_hours=10, timeline_weeks=12)
+                for j in range(paths_per_user)
+            ]
+            db.session.add(user)
+            db.session.flush()
+            owners.append((user.username, [path.id for path in user.skill_paths]))
+        db.session.commit()
+    return owners
+
+def wait_for(app, condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with app.app_context():
+            if condition():
+                return True
+        time.sleep(0.05)
+    return False
+
+def test_aggregates_match_full_recount_after_random_ratings(app):
+    app.extensions['feedback_buffer'].batch_size = 25
+    owners = create_users_and_paths(app, users=8, paths_per_user=4)
+    rng = random.Random(40)
+
+    submitted = {}
+    for username, path_ids in owners:
+        client = app.test_client()
+        client.post('/login', data={'username': username, 'password': 'password'})
+        # Users re-rate their paths, sometimes several times in one batch
+        for _ in range(40):
+            path_id = rng.choice(path_ids)
+            rating = rng.randint(1, 5)
+            response = client.post(f'/path/{path_id}/feedback', json={'rating': rating, 'comment': 'ok'})
+            assert response.status_code == 202
+            submitted[path_id] = rating
+
+    # The writer thread may still be finishing a batch when flush() returns
+    app.extensions['feedback_buffer'].flush()
+    assert wait_for(app, lambda: {row.skill_path_id: row.rating for row in Feedback.query} == submitted)
+
+    with app.app_context():
+        assert compare_rating_aggregates() == []
+        # One rating per user and path, holding the latest submission
+        assert Feedback.query.count() == len(submitted)
+        for path_id, rating in submitted.items():
+            summary = get_rating_summary('path', path_id)
+            assert summary['count'] == 1 and summary['average'] == rating
+
+        # The backfill rebuilds the same aggregates from scratch
+        rebuild_rating_aggregates()
+        assert compare_rating_aggregates() == []
+
+def test_bad_entry_is_dropped_without_blocking_the_rest(app):
+    buffer = app.extensions['feedback_buffer']
+    buffer.batch_size = 10
+    buffer.flush_seconds = 0.05
+    buffer.max_attempts = 2
+    owners = create_users_and_paths(app, users=1, paths_per_user=20)
+
+    with app.app_context():
+        user = User.query.filter_by(username=owners[0][0]).one()
+        for i, path in enumerate(user.skill_paths):
+            # An out-of-range rating stands in for an entry the database would reject
+            assert buffer.submit(user.id, path, 9 if i == 7 else 4, None)
+
+    assert wait_for(app, lambda: Feedback.query.count() == 19 and not buffer._pending)
+    with app.app_context():
+        assert compare_rating_aggregates() == []
@@ -0,0 +1,59 @@
+import io
+
+from skillpath.extensions import db
+from skillpath.models import SkillPath, PathStep, Resource, StepResource, User
+from skillpath.transfer import canonicalize_resource_urls
+
+def upload(admin_client, content, filename='catalogue.csv'):
+    response = admin_client.post('/admin/resources/import',
+                                 data={'file': (io.BytesIO(content.encode('utf-8')), filename)},
+                                 content_type='multipart/form-data')
+    assert response.status_code == 200
+    return response.get_json()['report']
+
+def test_import_skips_urls_added_through_the_admin_form(app, admin_client):
+    response = admin_client.post('/admin/resources/add', json={
+        'title': 'MDN Learn', 'type': 'documentation', 'category': 'Web Developer',
+        'url': 'https://developer.mozilla.org/en-US/docs/Learn/'
+    })
+    assert response.get_json()['resource']['url'] == 'https://developer.mozilla.org/en-US/docs/Learn'
+
+    report = upload(admin_client, 'title,url,type,category\n'
+                                  'MDN Learn,https://Developer.Mozilla.org/en-US/docs/Learn/,documentation,Web Developer\n'
+                                  'Flask Docs,https://flask.palletsprojects.com/,documentation,Web Developer\n')
+
+    assert report['duplicates'] == 1 and report['imported'] == 1
+    with app.app_context():
+        assert Resource.query.count() == 2
+        # Imported categories group with the career goals generated paths write
+        assert {resource.category for resource in Resource.query} == {'Web Developer'}
+
+def test_backfill_merges_spellings_of_the_same_url(app):
+    with app.app_context():
+        admin = User.query.filter_by(username='admin').one()
+        path = SkillPath(user_id=admin.id, title='Path', career_goal='Web Developer', current_level='beginner',
+                         weekly_hours=5, timeline_weeks=4)
+        path.steps = [PathStep(step_number=i, title=f'Step {i}', duration_weeks=1) for i in (1, 2)]
+        db.session.add(path)
+        db.session.flush()
+
+        spellings = ['https://example.com/guide', 'https://EXAMPLE.com/guide/', 'https://example.com/guide#intro']
+        resources = [Resource(title='Guide', url=url, type='article') for url in spellings]
+        db.session.add_all(resources)
+        db.session.flush()
+        # Stored before canonicalization existed
+        for resource, url in zip(resources, spellings):
+            Resource.query.filter_by(id=resource.id).update({'url': url})
+        first_step, second_step = path.steps
+        db.session.add_all([
+            StepResource(step_id=first_step.id, resource_id=resources[0].id),
+            StepResource(step_id=first_step.id, resource_id=resources[1].id),
+            StepResource(step_id=second_step.id, resource_id=resources[2].id)
+        ])
+        db.session.commit()
+
+        assert canonicalize_resource_urls() == (0, 2)
+        assert [r.url for r in Resource.query] == ['https://example.com/guide']
+        links = sorted(link.step_id for link in StepResource.query)
+        assert links == sorted([first_step.id, second_step.id])
+        assert {link.resource_id for link in StepResource.query} == {resources[0].id}
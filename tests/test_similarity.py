@@ -0,0 +1,16 @@
+from skillpath.local_generator import generate_local_learning_path
+from skillpath.similarity import adapt_generated_content
+
+def test_adapted_path_describes_the_new_request(app):
+    with app.app_context():
+        original = generate_local_learning_path('Data Scientist', 'beginner', 'statistics, pandas', 10, 12)
+    original['milestones'] = ['Finish the pandas project for the statistics course']
+
+    adapted = adapt_generated_content(original, 'Data Analyst', 'intermediate', 'SQL, dashboards', 5, 24)
+
+    assert adapted['title'] == 'Comprehensive Learning Path for Data Analyst'
+    assert 'from intermediate to professional level in Data Analyst' in adapted['description']
+    assert 'Focuses on SQL, dashboards with 5 hours per week over 24 weeks' in adapted['description']
+    assert 'pandas' not in adapted['description']
+    assert adapted['milestones'] == [step['title'] for step in adapted['steps'] if step['milestone']]
+    assert original['milestones'] == ['Finish the pandas project for the statistics course']